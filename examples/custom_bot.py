@@ -1,6 +1,5 @@
 """Example of a custom bot for Meshtastic client."""
 
-import time
 import random
 from meshtastic_client.core import MeshtasticClient
 from meshtastic_client.channel import ChannelManager
@@ -11,6 +10,8 @@ from meshtastic_client.bot import MeshtasticBot
 class WeatherBot(MeshtasticBot):
     """A bot that simulates weather reports."""
     
+    _CONDITIONS = ("Sunny", "Cloudy", "Partly cloudy", "Rainy", "Stormy", "Windy", "Foggy", "Snowy")
+    
     def __init__(self, client, channel_manager, name="WeatherBot", channel=0):
         """Initialize the Weather bot.
         
@@ -27,7 +28,7 @@ class WeatherBot(MeshtasticBot):
         self.register_command("forecast", self._cmd_forecast, "Get weather forecast")
         
         self.update_interval = 3600  # 1 hour
-        self.last_update = 0
+        self._rng = random.Random()
         self.current_weather = self._generate_weather()
     
     def _cmd_weather(self, args, from_id, packet):
@@ -65,29 +66,20 @@ class WeatherBot(MeshtasticBot):
         Returns:
             A string describing the weather
         """
-        conditions = ["Sunny", "Cloudy", "Partly cloudy", "Rainy", "Stormy", "Windy", "Foggy", "Snowy"]
-        temp = random.randint(-10, 35)  # Celsius
-        humidity = random.randint(30, 95)  # Percent
-        condition = random.choice(conditions)
+        temp = self._rng.randint(-10, 35)  # Celsius
+        humidity = self._rng.randint(30, 95)  # Percent
+        condition = self._rng.choice(self._CONDITIONS)
         
         return f"{condition}, {temp}°C, {humidity}% humidity"
     
-    def _run_loop(self):
-        """Run the bot's main loop."""
-        while self.running:
-            current_time = time.time()
-            
-            # Update weather periodically
-            if current_time - self.last_update > self.update_interval:
-                self.current_weather = self._generate_weather()
-                self.last_update = current_time
-                
-                # Announce weather update
-                self.client.send_message(f"Weather update: {self.current_weather}", self.channel)
-            
-            # Sleep for a bit to avoid high CPU usage
-            time.sleep(10)
-
+    def _register_periodic_tasks(self):
+        """Register the periodic weather update."""
+        self._schedule_periodic(lambda: self.update_interval, self._do_update)
+    
+    def _do_update(self):
+        """Update the weather and announce it."""
+        self.current_weather = self._generate_weather()
+        self.client.send_message(f"Weather update: {self.current_weather}", self.channel)
 
 def main():
     """Main function to demonstrate the custom bot."""
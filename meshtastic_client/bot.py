@@ -1,13 +1,116 @@
 """Bot interface for the Meshtastic client."""
 
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
+import re
+import sched
+import secrets
 import threading
 import time
-from abc import ABC, abstractmethod
+from abc import ABC
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Matches "/command [args...]"
+_COMMAND_RE = re.compile(r'^/(\w+)(?:\s+(.*))?$', re.DOTALL)
+
+# Shortest time (seconds) between two runs of a periodic task, whatever its interval
+MIN_PERIODIC_INTERVAL = 1.0
+
+class BotScheduler:
+    """Run the periodic tasks of many bots from a single thread."""
+    
+    def __init__(self):
+        """Initialize the scheduler; its thread starts with the first scheduled task."""
+        self._sched = sched.scheduler(time.monotonic, time.sleep)
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+    
+    def _run(self) -> None:
+        """Run scheduled tasks, sleeping until the next one is due."""
+        while True:
+            try:
+                delay = self._sched.run(blocking=False)
+            except Exception as e:
+                logger.error(f"Error in scheduled bot task: {str(e)}")
+                continue
+            
+            # Wait for the next deadline, or until a new task is scheduled
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+    
+    def schedule(self, delay: float, action: Callable[[], Any]) -> sched.Event:
+        """Schedule an action.
+        
+        Args:
+            delay: Seconds to wait before running the action
+            action: The function to call
+            
+        Returns:
+            The scheduled event, which can be passed to cancel()
+        """
+        if self._thread is None:
+            with self._thread_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="bots-scheduler")
+                    self._thread.daemon = True
+                    self._thread.start()
+        
+        event = self._sched.enter(delay, 0, action)
+        self._wakeup.set()
+        return event
+    
+    def cancel(self, event: sched.Event) -> None:
+        """Cancel a scheduled action.
+        
+        Args:
+            event: The event returned by schedule()
+        """
+        try:
+            self._sched.cancel(event)
+        except ValueError:
+            # The event has already run or been cancelled
+            pass
+
+
+@functools.lru_cache(maxsize=None)
+def get_default_scheduler() -> BotScheduler:
+    """Get the scheduler shared by bots that aren't owned by a BotsManager.
+    
+    Returns:
+        The shared BotScheduler instance
+    """
+    return BotScheduler()
+
+
+class _PeriodicTask:
+    """State of a callback run periodically by a bot."""
+    
+    def __init__(self, interval: Union[float, Callable[[], float]], callback: Callable[[], None]):
+        """Initialize the task.
+        
+        Args:
+            interval: Seconds between calls, or a function returning them
+            callback: The function to call
+        """
+        self.interval = interval
+        self.callback = callback
+        self.event: Optional[sched.Event] = None
+        self.token: Optional[object] = None  # Identifies the currently armed run
+        self.last_run = 0.0
+    
+    def delay(self) -> float:
+        """Get the current interval.
+        
+        Returns:
+            Seconds between calls
+        """
+        return self.interval() if callable(self.interval) else self.interval
+
+
 class MeshtasticBot(ABC):
     """Abstract base class for Meshtastic bots."""
     
@@ -26,7 +129,12 @@ class MeshtasticBot(ABC):
         self.channel = channel
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        self.scheduler: Optional[BotScheduler] = None  # Set by an owning BotsManager, else the shared default
+        self._periodic_tasks: Dict[Callable, _PeriodicTask] = {}
+        self._periodic_lock = threading.Lock()
         self.commands: Dict[str, Dict[str, Any]] = {}
+        self._commands_fast: Dict[str, Callable] = {}
+        self._help_cache: Optional[str] = None
         
         # Register default commands
         self.register_command("help", self._cmd_help, "Show this help message")
@@ -49,6 +157,8 @@ class MeshtasticBot(ABC):
             'handler': handler,
             'help': help_text
         }
+        self._commands_fast[command] = handler
+        self._help_cache = None
         logger.info(f"Registered command '/{command}' for bot '{self.name}'")
     
     def _handle_message(self, message: str, from_id: str, packet: Dict[str, Any]) -> None:
@@ -59,19 +169,26 @@ class MeshtasticBot(ABC):
             from_id: The sender ID
             packet: The full packet information
         """
-        # Check if this is a command
-        if message.startswith('/'):
-            parts = message.strip().split()
-            command = parts[0][1:]  # Remove the leading '/'
-            args = parts[1:] if len(parts) > 1 else []
-            
-            # Check if this is a command we handle
-            if command in self.commands:
-                logger.info(f"Bot '{self.name}' handling command '/{command}'")
-                self.commands[command]['handler'](args, from_id, packet)
-            else:
-                # Commands not recognized by this bot are ignored
-                pass
+        # Ignore messages from other channels and ordinary chat as cheaply as possible
+        if packet.get('channel', 0) != self.channel or message[:1] != '/':
+            return
+        
+        match = _COMMAND_RE.match(message)
+        if not match:
+            return
+        
+        command = match.group(1)
+        handler = self._commands_fast.get(command)
+        if handler is None:
+            # Commands not recognized by this bot are ignored
+            return
+        
+        # Only tokenize the arguments once we know we handle the command
+        rest = match.group(2)
+        args = rest.split() if rest else []
+        
+        logger.info(f"Bot '{self.name}' handling command '/{command}'")
+        handler(args, from_id, packet)
     
     def _cmd_help(self, args: List[str], from_id: str, packet: Dict[str, Any]) -> None:
         """Handle the help command.
@@ -81,12 +198,10 @@ class MeshtasticBot(ABC):
             from_id: The sender ID
             packet: The full packet information
         """
-        help_text = f"{self.name} Commands:\n"
-        
-        for cmd, info in self.commands.items():
-            help_text += f"/{cmd} - {info['help']}\n"
+        if self._help_cache is None:
+            self._help_cache = "".join(f"/{cmd} - {info['help']}\n" for cmd, info in self.commands.items())
         
-        self.client.send_message(help_text, self.channel)
+        self.client.send_message(f"{self.name} Commands:\n{self._help_cache}", self.channel)
     
     def _cmd_status(self, args: List[str], from_id: str, packet: Dict[str, Any]) -> None:
         """Handle the status command.
@@ -109,14 +224,19 @@ class MeshtasticBot(ABC):
             return
         
         self.running = True
-        self.thread = threading.Thread(target=self._run_loop)
-        self.thread.daemon = True
-        self.thread.start()
+        
+        # Only bots that implement their own loop need a dedicated thread
+        if type(self)._run_loop is not MeshtasticBot._run_loop:
+            self.thread = threading.Thread(target=self._run_loop)
+            self.thread.daemon = True
+            self.thread.start()
         
         logger.info(f"Bot '{self.name}' started")
         
         # Announce the bot is online
         self.client.send_message(f"{self.name} is now online!", self.channel)
+        
+        self._register_periodic_tasks()
     
     def stop(self) -> None:
         """Stop the bot."""
@@ -127,15 +247,94 @@ class MeshtasticBot(ABC):
         logger.info(f"Stopping bot '{self.name}'")
         self.running = False
         
+        with self._periodic_lock:
+            for task in self._periodic_tasks.values():
+                self.scheduler.cancel(task.event)
+            self._periodic_tasks.clear()
+        
         if self.thread:
             self.thread.join(timeout=2.0)
             
         # Announce the bot is offline
         self.client.send_message(f"{self.name} is going offline!", self.channel)
     
-    @abstractmethod
+    def _schedule_periodic(self, interval: Union[float, Callable[[], float]], callback: Callable[[], None]) -> None:
+        """Run a callback now and then periodically on the bot scheduler.
+        
+        Args:
+            interval: Seconds between calls, or a function returning them
+            callback: The function to call
+        """
+        if self.scheduler is None:
+            self.scheduler = get_default_scheduler()
+        
+        task = _PeriodicTask(interval, callback)
+        with self._periodic_lock:
+            self._periodic_tasks[callback] = task
+            self._arm_periodic(task, 0)
+    
+    def _reschedule_periodic(self, callback: Callable[[], None]) -> None:
+        """Re-arm a periodic task after its interval changed.
+        
+        The next call comes one new interval after the last one, or at once
+        if that time has already passed.
+        
+        Args:
+            callback: The callback passed to _schedule_periodic
+        """
+        with self._periodic_lock:
+            task = self._periodic_tasks.get(callback)
+            if task is None:
+                return
+            
+            self.scheduler.cancel(task.event)
+            self._arm_periodic(task, max(0.0, task.last_run + task.delay() - time.monotonic()))
+    
+    def _arm_periodic(self, task: _PeriodicTask, delay: float) -> None:
+        """Schedule the next run of a periodic task. Called with _periodic_lock held.
+        
+        Args:
+            task: The task to schedule
+            delay: Seconds until the run
+        """
+        # The scheduler is shared by all bots, so a zero interval must not spin it
+        delay = max(delay, task.last_run + MIN_PERIODIC_INTERVAL - time.monotonic())
+        
+        token = object()
+        task.token = token
+        task.event = self.scheduler.schedule(delay, lambda: self._run_periodic(task, token))
+    
+    def _run_periodic(self, task: _PeriodicTask, token: object) -> None:
+        """Run a periodic task and schedule its next run.
+        
+        Args:
+            task: The task to run
+            token: The token it was armed with; a stale token means it was rescheduled
+        """
+        with self._periodic_lock:
+            if not self.running or task.token is not token:
+                return
+            task.last_run = time.monotonic()
+        
+        try:
+            task.callback()
+        except Exception as e:
+            logger.error(f"Error in periodic task of bot '{self.name}': {str(e)}")
+        
+        with self._periodic_lock:
+            if self.running and task.token is token:
+                self._arm_periodic(task, task.delay())
+    
+    def _register_periodic_tasks(self) -> None:
+        """Register periodic tasks with _schedule_periodic. Override in subclasses."""
+        pass
+    
     def _run_loop(self) -> None:
-        """Run the bot's main loop. Must be implemented by subclasses."""
+        """Run the bot's main loop in a dedicated thread.
+        
+        Prefer _register_periodic_tasks for periodic work; a thread is only
+        started for subclasses that override this method.
+        """
         pass
 
 
@@ -159,7 +358,6 @@ class HelloWorldBot(MeshtasticBot):
         self.register_command("interval", self._cmd_interval, "Set the hello interval in seconds")
         
         self.hello_interval = 60  # seconds between hello messages
-        self.last_hello = 0
     
     def _cmd_hello(self, args: List[str], from_id: str, packet: Dict[str, Any]) -> None:
         """Handle the hello command.
@@ -194,28 +392,38 @@ class HelloWorldBot(MeshtasticBot):
             packet: The full packet information
         """
         if args and args[0].isdigit():
-            self.hello_interval = int(args[0])
+            interval = int(args[0])
+            if interval < MIN_PERIODIC_INTERVAL:
+                self.client.send_message(f"Hello interval must be at least {MIN_PERIODIC_INTERVAL:g} seconds", self.channel)
+                return
+            
+            self.hello_interval = interval
+            self._reschedule_periodic(self._do_hello)
             self.client.send_message(f"Hello interval set to {self.hello_interval} seconds", self.channel)
         else:
             self.client.send_message(f"Current hello interval is {self.hello_interval} seconds", self.channel)
     
-    def _run_loop(self) -> None:
-        """Run the bot's main loop."""
-        while self.running:
-            current_time = time.time()
-            
-            # Send periodic hello messages
-            if current_time - self.last_hello > self.hello_interval:
-                self.client.send_message(f"Hello everyone! I'm {self.name} and I'm still here!", self.channel)
-                self.last_hello = current_time
-            
-            # Sleep for a bit to avoid high CPU usage
-            time.sleep(1)
+    def _register_periodic_tasks(self) -> None:
+        """Register the periodic hello message."""
+        self._schedule_periodic(lambda: self.hello_interval, self._do_hello)
+    
+    def _do_hello(self) -> None:
+        """Send a periodic hello message."""
+        self.client.send_message(f"Hello everyone! I'm {self.name} and I'm still here!", self.channel)
 
 
 class TestBot(MeshtasticBot):
     """A bot for running tests on the Meshtastic network."""
     
+    # Throughput test batch size and pacing rate
+    THROUGHPUT_BATCH_BYTES = 1024  # bytes per batch
+    THROUGHPUT_RATE = 400  # bytes per second
+    
+    # Latency test sample count, maximum concurrent probes and ACK timeout
+    LATENCY_SAMPLES = 5
+    LATENCY_MAX_IN_FLIGHT = 3
+    LATENCY_TIMEOUT = 30.0  # seconds
+    
     def __init__(self, client, channel_manager, name: str = "TestBot", channel: int = 0):
         """Initialize the Test bot.
         
@@ -232,6 +440,12 @@ class TestBot(MeshtasticBot):
         self.register_command("report", self._cmd_report, "Show the last test report")
         
         self.last_test_results = {}
+        
+        # Latency probes waiting for their ACK, keyed by probe tag
+        self._latency_waiters: Dict[str, threading.Event] = {}
+        
+        # Held while a latency test runs, so repeated requests can't pile up
+        self._latency_lock = threading.Lock()
     
     def _cmd_test(self, args: List[str], from_id: str, packet: Dict[str, Any]) -> None:
         """Handle the test command.
@@ -252,7 +466,7 @@ class TestBot(MeshtasticBot):
         elif test_type == "throughput":
             self._run_throughput_test()
         elif test_type == "latency":
-            self._run_latency_test()
+            self._start_latency_test()
         else:
             self.client.send_message(f"Unknown test type: {test_type}", self.channel)
     
@@ -278,12 +492,13 @@ class TestBot(MeshtasticBot):
         """Run a ping test."""
         self.client.send_message("Starting ping test...", self.channel)
         
-        start_time = time.time()
-        success = self.client.send_message("PING", self.channel)
-        end_time = time.time()
+        # Time the write to the node, not just handing the message to the send queue
+        start_time = time.monotonic()
+        success = self.client.send_message_wait("PING", self.channel)
+        end_time = time.monotonic()
         
         if success:
-            result = f"Ping successful in {(end_time - start_time) * 1000:.2f}ms"
+            result = f"Ping written to node in {(end_time - start_time) * 1000:.2f}ms"
             self.last_test_results["ping"] = result
         else:
             result = "Ping failed"
@@ -295,27 +510,55 @@ class TestBot(MeshtasticBot):
         """Run a throughput test."""
         self.client.send_message("Starting throughput test...", self.channel)
         
-        # Generate a test message of about 200 bytes
+        # Generate a test message of about 200 bytes; packing fits in whatever it can
         test_message = "X" * 200
         
         messages_sent = 0
-        start_time = time.time()
+        bytes_sent = 0
+        batch: List[str] = []
+        batch_bytes = 0
+        
+        # Token bucket pacing so batches don't flood the network
+        tokens = float(self.THROUGHPUT_BATCH_BYTES)
+        last_refill = time.monotonic()
+        
+        start_time = time.monotonic()
         test_duration = 10  # seconds
         
-        while time.time() - start_time < test_duration:
-            success = self.client.send_message(f"THROUGHPUT-{messages_sent}: {test_message}", self.channel)
-            if success:
-                messages_sent += 1
-            time.sleep(0.5)  # Don't flood the network
+        while time.monotonic() - start_time < test_duration:
+            message = f"THROUGHPUT-{messages_sent + len(batch)}: {test_message}"
+            batch.append(message)
+            batch_bytes += len(message)
+            
+            if batch_bytes < self.THROUGHPUT_BATCH_BYTES:
+                continue
+            
+            # Wait until the bucket holds enough tokens for the whole batch
+            now = time.monotonic()
+            tokens += (now - last_refill) * self.THROUGHPUT_RATE
+            last_refill = now
+            if tokens < batch_bytes:
+                wait = (batch_bytes - tokens) / self.THROUGHPUT_RATE
+                time.sleep(wait)
+                tokens = float(batch_bytes)
+                last_refill += wait
+            tokens = min(tokens - batch_bytes, float(self.THROUGHPUT_BATCH_BYTES))
+            
+            # Wait for the write, so the result reflects the link and not just the queue
+            sent = self.client.send_messages_batch(batch, self.channel, wait=True)
+            messages_sent += sent
+            bytes_sent += sum(len(message) for message in batch[:sent])
+            batch = []
+            batch_bytes = 0
         
-        end_time = time.time()
+        end_time = time.monotonic()
         
         if messages_sent > 0:
             duration = end_time - start_time
-            bytes_sent = messages_sent * 200
             throughput = bytes_sent / duration
             
-            result = f"Sent {messages_sent} messages ({bytes_sent} bytes) in {duration:.2f}s = {throughput:.2f} bytes/s"
+            result = (f"Sent {messages_sent} messages ({bytes_sent} bytes) in {duration:.2f}s = {throughput:.2f} bytes/s"
+                      f" (paced at {self.THROUGHPUT_RATE} bytes/s)")
             self.last_test_results["throughput"] = result
         else:
             result = "Throughput test failed - no messages sent"
@@ -323,21 +566,70 @@ class TestBot(MeshtasticBot):
         
         self.client.send_message(result, self.channel)
     
+    def _start_latency_test(self) -> None:
+        """Run the latency test on its own thread.
+        
+        The test waits up to LATENCY_TIMEOUT per probe, which must not tie up
+        the client's message handler pool.
+        """
+        if not self._latency_lock.acquire(blocking=False):
+            self.client.send_message("Latency test already running", self.channel)
+            return
+        
+        def run() -> None:
+            try:
+                self._run_latency_test()
+            except Exception as e:
+                logger.error(f"Latency test of bot '{self.name}' failed: {str(e)}")
+            finally:
+                self._latency_lock.release()
+        
+        thread = threading.Thread(target=run, name=f"{self.name}-latency")
+        thread.daemon = True
+        thread.start()
+    
     def _run_latency_test(self) -> None:
-        """Run a latency test."""
+        """Run a latency test.
+        
+        Each probe is timed from its send until the radio reports the mesh
+        ACK for that packet, so no peer has to reply and only the probe
+        itself goes over the air.
+        """
         self.client.send_message("Starting latency test...", self.channel)
         
-        latencies = []
-        for i in range(5):
-            start_time = time.time()
-            success = self.client.send_message(f"LATENCY-{i}", self.channel)
-            end_time = time.time()
+        # Tells this run's probes apart from any earlier run's late ACKs
+        nonce = secrets.token_hex(2)
+        
+        def probe(seq: int) -> Optional[float]:
+            tag = f"LATENCY-{nonce}-{seq}"
+            waiter = threading.Event()
+            acked_at: List[float] = []
             
-            if success:
-                latency = (end_time - start_time) * 1000  # ms
-                latencies.append(latency)
+            def on_ack(packet: Dict[str, Any]) -> None:
+                # A routing error (e.g. no rebroadcast heard) is a NAK, not an answer
+                if packet.get('decoded', {}).get('routing', {}).get('errorReason', 'NONE') == 'NONE':
+                    acked_at.append(time.monotonic())
+                waiter.set()
             
-            time.sleep(1)  # Don't flood the network
+            self._latency_waiters[tag] = waiter
+            try:
+                start_time = time.monotonic()
+                if not self.client.send_message_wait(tag, self.channel, on_ack=on_ack):
+                    return None
+                if not waiter.wait(self.LATENCY_TIMEOUT) or not acked_at:
+                    return None
+                return (acked_at[0] - start_time) * 1000  # ms
+            finally:
+                self._latency_waiters.pop(tag, None)
+        
+        # Keep a few probes in flight so round trips overlap
+        latencies = []
+        with ThreadPoolExecutor(max_workers=self.LATENCY_MAX_IN_FLIGHT) as executor:
+            futures = [executor.submit(probe, i) for i in range(self.LATENCY_SAMPLES)]
+            for future in as_completed(futures):
+                latency = future.result()
+                if latency is not None:
+                    latencies.append(latency)
         
         if latencies:
             avg_latency = sum(latencies) / len(latencies)
@@ -347,13 +639,7 @@ class TestBot(MeshtasticBot):
             result = f"Latency: avg={avg_latency:.2f}ms, min={min_latency:.2f}ms, max={max_latency:.2f}ms"
             self.last_test_results["latency"] = result
         else:
-            result = "Latency test failed - no responses received"
+            result = "Latency test failed - no ACKs received"
             self.last_test_results["latency"] = result
         
         self.client.send_message(result, self.channel)
-    
-    def _run_loop(self) -> None:
-        """Run the bot's main loop."""
-        while self.running:
-            # Just sleep, this bot is primarily command-driven
-            time.sleep(1)
\ No newline at end of file
@@ -1,7 +1,7 @@
 """Bots manager for the Meshtastic client."""
 
-from typing import List, Dict, Optional, Type
-from .bot import MeshtasticBot, HelloWorldBot, TestBot
+from typing import Dict, Optional, Type
+from .bot import BotScheduler, MeshtasticBot, HelloWorldBot, TestBot
 from .logger import get_logger
 
 logger = get_logger(__name__)
@@ -18,11 +18,26 @@ class BotsManager:
         """
         self.client = client
         self.channel_manager = channel_manager
-        self.bots: List[MeshtasticBot] = []
+        self.bots: Dict[str, MeshtasticBot] = {}
         self.bot_classes: Dict[str, Type[MeshtasticBot]] = {
             'HelloWorldBot': HelloWorldBot,
             'TestBot': TestBot
         }
+        
+        # Bumped whenever bots are added or started/stopped, so views can cache
+        self._version = 0
+        
+        # A single scheduler thread drives the periodic tasks of all bots
+        self.scheduler = BotScheduler()
+    
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the bots change, so views can cache.
+        
+        Returns:
+            The current version
+        """
+        return self._version
     
     def register_bot_class(self, name: str, bot_class: Type[MeshtasticBot]) -> None:
         """Register a bot class.
@@ -49,10 +64,16 @@ class BotsManager:
             logger.error(f"Bot class not found: {bot_class_name}")
             return None
         
+        if bot_name in self.bots:
+            logger.error(f"Bot already exists: {bot_name}")
+            return None
+        
         try:
             bot_class = self.bot_classes[bot_class_name]
             bot = bot_class(self.client, self.channel_manager, bot_name, channel)
-            self.bots.append(bot)
+            bot.scheduler = self.scheduler
+            self.bots[bot_name] = bot
+            self._version += 1
             logger.info(f"Created {bot_class_name} instance: {bot_name} on channel {channel}")
             return bot
         except Exception as e:
@@ -68,10 +89,7 @@ class BotsManager:
         Returns:
             The bot instance, or None if not found
         """
-        for bot in self.bots:
-            if bot.name == name:
-                return bot
-        return None
+        return self.bots.get(name)
     
     def start_bot(self, name: str) -> bool:
         """Start a bot.
@@ -89,6 +107,7 @@ class BotsManager:
         
         try:
             bot.start()
+            self._version += 1
             return True
         except Exception as e:
             logger.error(f"Failed to start bot: {str(e)}")
@@ -110,6 +129,7 @@ class BotsManager:
         
         try:
             bot.stop()
+            self._version += 1
             return True
         except Exception as e:
             logger.error(f"Failed to stop bot: {str(e)}")
@@ -117,19 +137,21 @@ class BotsManager:
     
     def start_all_bots(self) -> None:
         """Start all bots."""
-        for bot in self.bots:
+        for bot in self.bots.values():
             try:
                 bot.start()
             except Exception as e:
                 logger.error(f"Failed to start bot {bot.name}: {str(e)}")
+        self._version += 1
     
     def stop_all_bots(self) -> None:
         """Stop all bots."""
-        for bot in self.bots:
+        for bot in self.bots.values():
             try:
                 bot.stop()
             except Exception as e:
                 logger.error(f"Failed to stop bot {bot.name}: {str(e)}")
+        self._version += 1
     
     def create_default_bots(self) -> None:
         """Create default bots."""
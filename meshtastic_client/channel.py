@@ -1,8 +1,8 @@
 """Channel management for the Meshtastic client."""
 
-from typing import Dict, List, Optional, Any
-import random
-import string
+from typing import Dict, List, Optional, Any, Set, Tuple
+import secrets
+import time
 from .logger import get_logger
 
 logger = get_logger(__name__)
@@ -18,6 +18,61 @@ class ChannelManager:
         """
         self.client = client
         self._channels: Dict[str, Dict[str, Any]] = {}
+        self._name_to_index: Dict[str, int] = {}
+        self._settings_cache: Optional[Tuple[float, Any]] = None
+        
+        # Slots we have filled, which a cached settings snapshot may not show yet
+        self._claimed_slots: Set[int] = set()
+        
+        # Bumped whenever channels are known to have changed, so views can cache
+        self._version = 0
+        
+        # A (re)connected node may have renamed or reordered its channels
+        self.client.register_connection_handler(self._on_connection_changed)
+    
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the channels change, so views can cache.
+        
+        Returns:
+            The current version
+        """
+        return self._version
+    
+    def invalidate_cache(self) -> None:
+        """Forget cached channel lookups, e.g. after channels were changed externally."""
+        self._name_to_index.clear()
+        self._settings_cache = None
+        self._claimed_slots.clear()
+        self._version += 1
+    
+    def _on_connection_changed(self, connected: bool) -> None:
+        """Drop cached channel lookups when the client connects to the node.
+        
+        Args:
+            connected: Whether the client is now connected
+        """
+        if connected:
+            self.invalidate_cache()
+    
+    def _fetch_settings(self, max_age: float = 2.0) -> Any:
+        """Get the node's channel settings, reusing a recent snapshot if available.
+        
+        Args:
+            max_age: Maximum age in seconds of a cached snapshot
+            
+        Returns:
+            The channel settings reported by the node
+        """
+        now = time.monotonic()
+        if self._settings_cache is not None:
+            fetched_at, settings = self._settings_cache
+            if now - fetched_at <= max_age:
+                return settings
+        
+        settings = self.client.interface.getChannelSettings()
+        self._settings_cache = (now, settings)
+        return settings
     
     def create_test_channel(self, name: str = "test", psk: Optional[str] = None) -> bool:
         """Create a test channel on the Meshtastic node.
@@ -36,18 +91,18 @@ class ChannelManager:
         try:
             # Generate a random PSK if not provided
             if psk is None:
-                psk = ''.join(random.choices(string.ascii_lowercase + string.digits, k=16))
+                psk = secrets.token_hex(8)
             
             logger.info(f"Creating test channel '{name}' with PSK: {psk}")
             
             # Find the next available channel index
-            settings = self.client.interface.getChannelSettings()
-            next_index = 0
+            slots = self._fetch_settings().settings
+            claimed = self._claimed_slots
+            next_index = next((i for i, slot in enumerate(slots) if not slot.active and i not in claimed), None)
             
-            for i in range(8):  # Meshtastic supports up to 8 channels
-                if not settings.settings[i].active:
-                    next_index = i
-                    break
+            if next_index is None:
+                logger.error(f"Cannot create channel '{name}': no free channel slot")
+                return False
             
             # Create the channel
             self.client.interface.setChannelSettings(next_index, {
@@ -56,6 +111,10 @@ class ChannelManager:
                 'modemConfig': 3,  # LONG_FAST
                 'active': True
             })
+            # Keep the snapshot usable for the next create by remembering the slot we just took;
+            # the snapshot itself may be the interface's live state, so it is left alone
+            claimed.add(next_index)
+            self._version += 1
             
             # Store channel info
             self._channels[name] = {
@@ -64,6 +123,7 @@ class ChannelManager:
                 'name': name,
                 'active': True
             }
+            self._name_to_index[name] = next_index
             
             logger.info(f"Successfully created channel '{name}' with index {next_index}")
             return True
@@ -82,20 +142,14 @@ class ChannelManager:
             return []
         
         try:
-            settings = self.client.interface.getChannelSettings()
-            channels = []
+            slots = self.client.interface.getChannelSettings().settings
             
-            for i in range(8):  # Meshtastic supports up to 8 channels
-                channel = settings.settings[i]
-                if channel.active:
-                    channels.append({
-                        'index': i,
-                        'name': channel.name,
-                        'active': channel.active,
-                        'modemConfig': channel.modemConfig
-                    })
-            
-            return channels
+            return [{
+                'index': i,
+                'name': channel.name,
+                'active': channel.active,
+                'modemConfig': channel.modemConfig
+            } for i, channel in enumerate(slots) if channel.active]
         except Exception as e:
             logger.error(f"Failed to list channels: {str(e)}")
             return []
@@ -114,14 +168,13 @@ class ChannelManager:
             logger.error("Cannot send to channel: not connected")
             return False
         
-        # Find channel index by name
-        channels = self.list_channels()
-        channel_index = None
+        # Find channel index by name, refreshing the cache from the node on a miss
+        channel_index = self._name_to_index.get(channel_name)
         
-        for channel in channels:
-            if channel['name'] == channel_name:
-                channel_index = channel['index']
-                break
+        if channel_index is None:
+            for channel in self.list_channels():
+                self._name_to_index[channel['name']] = channel['index']
+            channel_index = self._name_to_index.get(channel_name)
         
         if channel_index is None:
             logger.error(f"Channel '{channel_name}' not found")
@@ -1,10 +1,14 @@
 """Core functionality for the Meshtastic client."""
 
-import time
+import asyncio
+import inspect
+import queue
 import threading
-from typing import Optional, Callable, Dict, Any, List
-import requests
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, Callable, Dict, Any, List, Tuple
 import meshtastic
+import meshtastic.tcp_interface
 from meshtastic.mesh_interface import MeshInterface
 from meshtastic import portnums_pb2, mesh_pb2
 
@@ -12,6 +16,116 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Delay before reconnecting, doubled after each failed attempt
+RECONNECT_DELAY_INITIAL = 0.05  # seconds
+RECONNECT_DELAY_MAX = 1.0  # seconds
+
+# How long to wait for the node to report its info after connecting
+READY_POLL_ATTEMPTS = 10
+READY_POLL_INTERVAL = 0.1  # seconds
+
+# How long the interface waits for the node's config (and other replies).
+# Only passed on library versions whose TCPInterface accepts a timeout.
+CONNECT_TIMEOUT = 30  # seconds
+_TCP_INTERFACE_KWARGS: Dict[str, Any] = (
+    {"timeout": CONNECT_TIMEOUT}
+    if "timeout" in inspect.signature(meshtastic.tcp_interface.TCPInterface.__init__).parameters
+    else {}
+)
+
+# Looked up once rather than on every received packet
+_TEXT_MESSAGE_APP = portnums_pb2.TEXT_MESSAGE_APP
+
+# Reply to the built-in /help command
+HELP_TEXT = (
+    "Available commands:\n"
+    "/help - Show this help message\n"
+    "/ping - Test connectivity\n"
+    "/status - Show client status\n"
+    "/echo <message> - Echo a message back\n"
+    "/channel list - List available channels\n"
+    "/channel join <name> - Join a channel"
+)
+
+# Maximum number of message handlers running at the same time
+HANDLER_POOL_SIZE = 8
+
+# Outbound send queue size and retry backoff for a congested link
+SEND_QUEUE_SIZE = 64
+SEND_RETRIES = 5
+SEND_BACKOFF_INITIAL = 0.05  # seconds
+SEND_BACKOFF_MAX = 2.0  # seconds
+
+# How long a caller waits for its message to be written, and close() for the queue to drain
+SEND_WAIT_TIMEOUT = 10.0  # seconds
+SEND_DRAIN_TIMEOUT = 5.0  # seconds
+
+# Largest text payload that fits into a single Meshtastic packet
+MAX_PAYLOAD_BYTES = mesh_pb2.Constants.DATA_PAYLOAD_LEN
+
+
+def _split_text(text: str, limit: int) -> List[str]:
+    """Split text into pieces no larger than limit bytes when UTF-8 encoded.
+    
+    Args:
+        text: The text to split
+        limit: The maximum size of each piece in bytes
+        
+    Returns:
+        List of text pieces
+    """
+    encoded = text.encode("utf-8")
+    if len(encoded) <= limit:
+        return [text]
+    
+    pieces = []
+    while encoded:
+        cut = limit
+        # Don't cut in the middle of a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        pieces.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+    
+    return pieces
+
+
+def _pack_payloads(messages: List[str], limit: int) -> List[Tuple[str, int]]:
+    """Pack newline-framed messages into as few payloads as possible.
+    
+    Args:
+        messages: The messages to pack
+        limit: The maximum size of each payload in bytes
+        
+    Returns:
+        List of (payload, count) pairs, each payload no larger than limit
+        bytes; count is the number of messages whose last piece it carries
+    """
+    payloads = []
+    current: Optional[str] = None
+    current_size = 0
+    completed = 0
+    
+    for message in messages:
+        for piece in _split_text(message, limit):
+            piece_size = len(piece.encode("utf-8"))
+            if current is not None and current_size + 1 + piece_size <= limit:
+                current += "\n" + piece
+                current_size += 1 + piece_size
+            else:
+                if current is not None:
+                    payloads.append((current, completed))
+                    completed = 0
+                current = piece
+                current_size = piece_size
+        completed += 1
+    
+    if current is not None:
+        payloads.append((current, completed))
+    
+    return payloads
+
+
 class MeshtasticClient:
     """Core client for connecting to a Meshtastic node."""
     
@@ -25,7 +139,18 @@ class MeshtasticClient:
         self.address = address
         self.interface: Optional[MeshInterface] = None
         self.connected = False
-        self.message_handlers: Dict[str, List[Callable]] = {}
+        self._reconnect_delay = RECONNECT_DELAY_INITIAL
+        self.message_handlers: Dict[int, Tuple[Callable, ...]] = {}
+        self.connection_handlers: Tuple[Callable[[bool], None], ...] = ()
+        self._handler_pool: Optional[ThreadPoolExecutor] = None
+        self._send_q: "queue.Queue[Tuple[str, int, Optional[Future], Optional[Callable]]]" = queue.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._sender_thread: Optional[threading.Thread] = None
+        self._commands: Dict[str, Callable[[str, int, str], None]] = {
+            "help": self._cmd_help,
+            "ping": self._cmd_ping,
+            "status": self._cmd_status,
+            "echo": self._cmd_echo,
+        }
         
         if auto_connect:
             self.connect()
@@ -33,48 +158,170 @@ class MeshtasticClient:
     def connect(self) -> bool:
         """Connect to the Meshtastic node.
         
+        Returns:
+            bool: True if connection was successful, False otherwise
+        """
+        return self._do_connect()
+    
+    async def connect_async(self) -> bool:
+        """Connect to the Meshtastic node without blocking the event loop.
+        
+        Returns:
+            bool: True if connection was successful, False otherwise
+        """
+        return await self._run_in_thread(self._do_connect)
+    
+    async def reconnect_async(self) -> bool:
+        """Reconnect to the Meshtastic node without blocking the event loop.
+        
+        Returns:
+            bool: True if reconnection was successful, False otherwise
+        """
+        return await self._run_in_thread(self.reconnect)
+    
+    async def _run_in_thread(self, func: Callable[[], bool]) -> bool:
+        """Run a blocking connection function in a worker thread.
+        
+        The attempt is always awaited to completion: abandoning it would leave
+        a half-open interface behind that could still publish itself later.
+        Constructing the interface blocks in the TCP connect, bounded only by
+        the OS connect timeout, and in the config handshake, bounded by
+        CONNECT_TIMEOUT where the library accepts one and by its own
+        several-minute default otherwise.
+        
+        Args:
+            func: The blocking function to run
+            
+        Returns:
+            bool: The function's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func)
+    
+    def _do_connect(self) -> bool:
+        """Connect to the Meshtastic node, blocking until it is ready.
+        
         Returns:
             bool: True if connection was successful, False otherwise
         """
         try:
-            logger.info(f"Connecting to Meshtastic node at {self.address}")
-            self.interface = meshtastic.tcp_interface.TCPInterface(self.address)
+            logger.info("Connecting to Meshtastic node at %s", self.address)
+            self.interface = meshtastic.tcp_interface.TCPInterface(self.address, **_TCP_INTERFACE_KWARGS)
             
-            # Check connection with a simple HTTP request to the device
-            response = requests.get(f"http://{self.address}/hotspot-detect", timeout=5)
+            # The node info is only populated once the config handshake completes
+            if not self._wait_until_ready():
+                logger.error("Timed out waiting for the Meshtastic node to become ready")
+                self._close_interface()
+                self._set_connected(False)
+                return False
             
-            if response.status_code == 200:
-                logger.info(f"Successfully connected to Meshtastic node at {self.address}")
-                self.connected = True
-                self._setup_message_handler()
+            logger.info("Successfully connected to Meshtastic node at %s", self.address)
+            self._set_connected(True)
+            self._reconnect_delay = RECONNECT_DELAY_INITIAL
+            self._setup_message_handler()
+            return True
+        except Exception as e:
+            logger.error("Failed to connect to Meshtastic node: %s", e)
+            self._set_connected(False)
+            return False
+    
+    def _close_interface(self) -> None:
+        """Close the current interface, if any, and forget it."""
+        interface, self.interface = self.interface, None
+        if interface:
+            try:
+                interface.close()
+            except Exception as e:
+                logger.error("Error closing connection: %s", e)
+    
+    def _set_connected(self, connected: bool) -> None:
+        """Update the connection state, notifying handlers when it changes.
+        
+        Args:
+            connected: Whether the client is now connected
+        """
+        if connected == self.connected:
+            return
+        
+        self.connected = connected
+        for handler in self.connection_handlers:
+            try:
+                handler(connected)
+            except Exception as e:
+                logger.error("Error in connection handler: %s", e)
+    
+    def _wait_until_ready(self) -> bool:
+        """Wait for the interface to report the node's info.
+        
+        Returns:
+            bool: True if the node became ready in time, False otherwise
+        """
+        for _ in range(READY_POLL_ATTEMPTS):
+            if self.interface and self.interface.myInfo is not None:
                 return True
+            time.sleep(READY_POLL_INTERVAL)
+        return False
+    
+    def _link_alive(self) -> bool:
+        """Check whether the current interface can still reach the node.
+        
+        A write that doesn't raise proves little on its own: it may only reach
+        the kernel buffer, and the interface drops writes once its socket is
+        gone. The interface clears isConnected when it sees the link drop, so
+        that has to be set as well.
+        
+        Returns:
+            bool: True if the node is ready, still connected and accepted a heartbeat, False otherwise
+        """
+        interface = self.interface
+        if not interface or interface.myInfo is None or not interface.isConnected.is_set():
+            return False
+        
+        try:
+            send_heartbeat = getattr(interface, "sendHeartbeat", None)
+            if send_heartbeat is not None:
+                send_heartbeat()
             else:
-                logger.error(f"Connection test failed with status: {response.status_code}")
-                return False
+                # Older library versions: an empty ToRadio is the keepalive their heartbeat timer sends
+                interface._sendToRadio(mesh_pb2.ToRadio())
+            return True
         except Exception as e:
-            logger.error(f"Failed to connect to Meshtastic node: {str(e)}")
-            self.connected = False
+            logger.info("Existing connection failed heartbeat: %s", e)
             return False
     
     def reconnect(self) -> bool:
         """Reconnect to the Meshtastic node.
         
+        A link that still accepts a heartbeat is kept, so a transient blip
+        doesn't cost a new TCP handshake and config replay. When reconnecting
+        many clients to the same node, stagger the calls to avoid flooding it.
+        
         Returns:
             bool: True if reconnection was successful, False otherwise
         """
-        if self.interface:
-            try:
-                self.interface.close()
-            except Exception as e:
-                logger.error(f"Error closing existing connection: {str(e)}")
+        if self._link_alive():
+            logger.info("Connection to Meshtastic node is still alive")
+            self._set_connected(True)
+            return True
         
-        self.interface = None
-        self.connected = False
-        time.sleep(1)  # Short delay before reconnecting
+        self._close_interface()
+        self._set_connected(False)
+        
+        # Back off between repeated attempts without penalizing a one-off blip
+        time.sleep(self._reconnect_delay)
+        self._reconnect_delay = min(self._reconnect_delay * 2, RECONNECT_DELAY_MAX)
         return self.connect()
     
     def _setup_message_handler(self) -> None:
         """Set up the message handler for the Meshtastic interface."""
+        if self._handler_pool is None:
+            self._handler_pool = ThreadPoolExecutor(max_workers=HANDLER_POOL_SIZE, thread_name_prefix="mesh-handler")
+        
+        if self._sender_thread is None or not self._sender_thread.is_alive():
+            self._sender_thread = threading.Thread(target=self._run_sender, name="mesh-sender")
+            self._sender_thread.daemon = True
+            self._sender_thread.start()
+        
         if self.interface:
             self.interface.onReceive = self._on_message_received
     
@@ -85,25 +332,46 @@ class MeshtasticClient:
             packet: The received packet
             interface: The mesh interface that received the packet
         """
+        # Most packets (position, telemetry, routing, config) aren't text: reject them first
+        decoded = packet.get("decoded")
+        if decoded is None or decoded.get("portnum") != _TEXT_MESSAGE_APP:
+            return
+        
         try:
-            if packet.get("decoded", {}).get("portnum") == portnums_pb2.TEXT_MESSAGE_APP:
-                message = packet.get("decoded", {}).get("text", "")
-                channel = packet.get("channel", 0)
-                from_id = packet.get("fromId", "unknown")
-                
-                logger.info(f"Message received on channel {channel} from {from_id}: {message}")
-                
-                # Process commands if message starts with '/'
-                if message.startswith('/'):
-                    self._handle_command(message, channel, from_id)
-                
-                # Call any registered handlers for this channel
-                channel_key = str(channel)
-                if channel_key in self.message_handlers:
-                    for handler in self.message_handlers[channel_key]:
-                        threading.Thread(target=handler, args=(message, from_id, packet)).start()
+            message = decoded.get("text", "")
+            channel = packet.get("channel", 0)
+            from_id = packet.get("fromId", "unknown")
+            
+            logger.info("Message received on channel %s from %s: %s", channel, from_id, message)
+            
+            # Process commands if message starts with '/'
+            if message[:1] == '/':
+                self._handle_command(message, channel, from_id)
+            
+            # Call any registered handlers for this channel
+            handlers = self.message_handlers.get(channel)
+            pool = self._handler_pool
+            if handlers and pool:
+                submit = pool.submit
+                run_handler = self._run_handler
+                for handler in handlers:
+                    submit(run_handler, handler, message, from_id, packet)
+        except Exception as e:
+            logger.error("Error processing message: %s", e)
+    
+    def _run_handler(self, handler: Callable, message: str, from_id: str, packet: Dict[str, Any]) -> None:
+        """Run a message handler on the handler pool, logging any error it raises.
+        
+        Args:
+            handler: The registered message handler
+            message: The message text
+            from_id: The sender ID
+            packet: The full packet information
+        """
+        try:
+            handler(message, from_id, packet)
         except Exception as e:
-            logger.error(f"Error processing message: {str(e)}")
+            logger.error("Error in message handler: %s", e)
     
     def _handle_command(self, message: str, channel: int, from_id: str) -> None:
         """Handle command messages from the Meshtastic network.
@@ -113,63 +381,242 @@ class MeshtasticClient:
             channel: The channel number
             from_id: The sender ID
         """
-        parts = message.strip().split()
-        command = parts[0][1:]  # Remove the leading '/'
-        args = parts[1:] if len(parts) > 1 else []
-        
-        logger.info(f"Command received: {command} with args: {args}")
-        
-        if command == "help":
-            help_text = (
-                "Available commands:\n"
-                "/help - Show this help message\n"
-                "/ping - Test connectivity\n"
-                "/status - Show client status\n"
-                "/echo <message> - Echo a message back\n"
-                "/channel list - List available channels\n"
-                "/channel join <name> - Join a channel"
-            )
-            self.send_message(help_text, channel)
-        
-        elif command == "ping":
-            self.send_message("Pong!", channel)
-        
-        elif command == "status":
-            status = f"Meshtastic Client Status:\n"
-            status += f"Connected: {self.connected}\n"
-            status += f"Node: {self.address}\n"
+        # Split off the command name only; handlers parse the rest if they need to
+        parts = message[1:].split(None, 1)
+        if not parts:
+            return
+        
+        command = parts[0]
+        rest = parts[1] if len(parts) > 1 else ""
+        
+        logger.info("Command received: %s with args: %s", command, rest)
+        
+        handler = self._commands.get(command)
+        if handler:
+            handler(rest, channel, from_id)
+    
+    def _cmd_help(self, rest: str, channel: int, from_id: str) -> None:
+        """Handle the help command.
+        
+        Args:
+            rest: The text following the command
+            channel: The channel number
+            from_id: The sender ID
+        """
+        self.send_message(HELP_TEXT, channel)
+    
+    def _cmd_ping(self, rest: str, channel: int, from_id: str) -> None:
+        """Handle the ping command.
+        
+        Args:
+            rest: The text following the command
+            channel: The channel number
+            from_id: The sender ID
+        """
+        self.send_message("Pong!", channel)
+    
+    def _cmd_status(self, rest: str, channel: int, from_id: str) -> None:
+        """Handle the status command.
+        
+        Args:
+            rest: The text following the command
+            channel: The channel number
+            from_id: The sender ID
+        """
+        lines = [
+            "Meshtastic Client Status:",
+            f"Connected: {self.connected}",
+            f"Node: {self.address}",
+        ]
+        
+        if self.interface:
+            lines.append(f"Node info: {self.interface.getMyNodeInfo()}")
+        
+        self.send_message("\n".join(lines), channel)
+    
+    def _cmd_echo(self, rest: str, channel: int, from_id: str) -> None:
+        """Handle the echo command.
+        
+        Args:
+            rest: The text following the command
+            channel: The channel number
+            from_id: The sender ID
+        """
+        echo_text = rest.rstrip() or "You didn't say anything!"
+        self.send_message(f"Echo: {echo_text}", channel)
+    
+    def _run_sender(self) -> None:
+        """Drain the outbound queue, writing one message at a time to the node."""
+        while True:
+            message, channel, written, on_ack = self._send_q.get()
+            sent = False
+            try:
+                sent = self._send_with_backoff(message, channel, on_ack)
+            finally:
+                if written is not None:
+                    written.set_result(sent)
+                self._send_q.task_done()
+    
+    def _send_with_backoff(self, message: str, channel: int, on_ack: Optional[Callable[[Dict[str, Any]], None]] = None) -> bool:
+        """Write a message to the node, backing off while the link is congested.
+        
+        Args:
+            message: The message to send
+            channel: The channel number to send on
+            on_ack: Called with the routing packet that ACKs or NAKs the message
             
-            if self.interface:
-                status += f"Node info: {self.interface.getMyNodeInfo()}\n"
+        Returns:
+            bool: True if the message was written, False if it was dropped
+        """
+        delay = SEND_BACKOFF_INITIAL
+        send_kwargs: Dict[str, Any] = {}
+        
+        if on_ack is not None:
+            def onAckNak(packet: Dict[str, Any]) -> None:
+                # The library only passes plain ACKs to a response handler of this name
+                on_ack(packet)
             
-            self.send_message(status, channel)
+            send_kwargs["onResponse"] = onAckNak
         
-        elif command == "echo":
-            echo_text = " ".join(args) if args else "You didn't say anything!"
-            self.send_message(f"Echo: {echo_text}", channel)
+        for _ in range(SEND_RETRIES):
+            interface = self.interface
+            if not interface:
+                logger.error("Dropping queued message: not connected")
+                return False
+            
+            try:
+                interface.sendText(message, wantAck=True, channelIndex=channel, **send_kwargs)
+                return True
+            except OSError as e:
+                # Socket buffer full or link reset: give the node time to drain
+                logger.warning("Send failed, retrying in %.2fs: %s", delay, e)
+                time.sleep(delay)
+                delay = min(delay * 2, SEND_BACKOFF_MAX)
+            except Exception as e:
+                logger.error("Failed to send message: %s", e)
+                return False
+        
+        logger.error("Giving up on message after %s attempts", SEND_RETRIES)
+        return False
+    
+    def _enqueue(self, message: str, channel: int, written: Optional[Future] = None,
+                 on_ack: Optional[Callable[[Dict[str, Any]], None]] = None) -> bool:
+        """Queue a message for the sender thread without blocking.
+        
+        Args:
+            message: The message to send
+            channel: The channel number to send on
+            written: Future resolved with whether the message was written
+            on_ack: Called with the routing packet that ACKs or NAKs the message
+            
+        Returns:
+            bool: True if the message was queued, False if the queue is full
+        """
+        try:
+            self._send_q.put_nowait((message, channel, written, on_ack))
+            return True
+        except queue.Full:
+            logger.error("Cannot send message: send queue is full")
+            return False
     
     def send_message(self, message: str, channel: int = 0) -> bool:
-        """Send a message to the Meshtastic network.
+        """Queue a message for sending to the Meshtastic network.
+        
+        Messages are written by a single sender thread that backs off while
+        the link is congested. When the queue is full the message is rejected
+        instead of blocking the caller.
         
         Args:
             message: The message to send
             channel: The channel number to send on
             
         Returns:
-            bool: True if message was sent successfully, False otherwise
+            bool: True if message was queued successfully, False otherwise
         """
         if not self.connected or not self.interface:
             logger.error("Cannot send message: not connected")
             return False
         
+        logger.info("Sending message on channel %s: %s", channel, message)
+        return self._enqueue(message, channel)
+    
+    def send_message_wait(self, message: str, channel: int = 0, timeout: float = SEND_WAIT_TIMEOUT,
+                          on_ack: Optional[Callable[[Dict[str, Any]], None]] = None) -> bool:
+        """Send a message and wait until it has been written to the node.
+        
+        Unlike send_message, this blocks until the sender thread has handed
+        the message to the node, so callers can time the actual write.
+        
+        Args:
+            message: The message to send
+            channel: The channel number to send on
+            timeout: How long to wait for the write, in seconds
+            on_ack: Called, on the interface's receive thread, with the routing
+                packet that ACKs or NAKs the message once the mesh answers
+            
+        Returns:
+            bool: True if the message was written, False otherwise
+        """
+        if not self.connected or not self.interface:
+            logger.error("Cannot send message: not connected")
+            return False
+        
+        logger.info("Sending message on channel %s: %s", channel, message)
+        written: Future = Future()
+        if not self._enqueue(message, channel, written, on_ack):
+            return False
+        
         try:
-            logger.info(f"Sending message on channel {channel}: {message}")
-            self.interface.sendText(message, wantAck=True, channelIndex=channel)
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send message: {str(e)}")
+            return written.result(timeout)
+        except FutureTimeoutError:
+            logger.error("Timed out waiting for message to be written")
             return False
     
+    def send_messages_batch(self, messages: List[str], channel: int = 0, wait: bool = False) -> int:
+        """Send several messages using as few packets as possible.
+        
+        Messages are joined with newlines and packed into payloads of at most
+        MAX_PAYLOAD_BYTES, so each write carries as many messages as will fit.
+        Queuing stops at the first payload the full send queue rejects, so the
+        messages counted are always the leading ones.
+        
+        Args:
+            messages: The messages to send
+            channel: The channel number to send on
+            wait: Whether to block until the payloads have been written to the node
+            
+        Returns:
+            int: The number of messages queued, or written when wait is set
+        """
+        if not self.connected or not self.interface:
+            logger.error("Cannot send messages: not connected")
+            return 0
+        
+        payloads = _pack_payloads(messages, MAX_PAYLOAD_BYTES)
+        logger.info("Sending %s messages in %s packets on channel %s", len(messages), len(payloads), channel)
+        
+        queued: List[Tuple[int, Optional[Future]]] = []
+        for payload, count in payloads:
+            written: Optional[Future] = Future() if wait else None
+            if not self._enqueue(payload, channel, written):
+                break
+            queued.append((count, written))
+        
+        if not wait:
+            return sum(count for count, _ in queued)
+        
+        sent = 0
+        deadline = time.monotonic() + SEND_WAIT_TIMEOUT
+        for count, written in queued:
+            try:
+                if written.result(max(0.0, deadline - time.monotonic())):
+                    sent += count
+            except FutureTimeoutError:
+                logger.error("Timed out waiting for messages to be written")
+                break
+        
+        return sent
+    
     def register_message_handler(self, handler: Callable, channel: int = 0) -> None:
         """Register a handler for incoming messages on a specific channel.
         
@@ -177,21 +624,54 @@ class MeshtasticClient:
             handler: The handler function to call when a message is received
             channel: The channel number to register for
         """
-        channel_key = str(channel)
-        if channel_key not in self.message_handlers:
-            self.message_handlers[channel_key] = []
+        # Replace the tuple rather than mutating it, so readers always see a consistent snapshot
+        self.message_handlers[channel] = self.message_handlers.get(channel, ()) + (handler,)
+        logger.info("Registered message handler for channel %s", channel)
+    
+    def register_connection_handler(self, handler: Callable[[bool], None]) -> None:
+        """Register a handler called whenever the connection state changes.
+        
+        Args:
+            handler: The handler function, called with the new connection state
+        """
+        self.connection_handlers = self.connection_handlers + (handler,)
+    
+    def _drain_send_queue(self, timeout: float) -> None:
+        """Wait for the sender thread to write out queued messages.
+        
+        Args:
+            timeout: The longest time to wait, in seconds
+        """
+        if self._sender_thread is None or not self._sender_thread.is_alive():
+            return
         
-        self.message_handlers[channel_key].append(handler)
-        logger.info(f"Registered message handler for channel {channel}")
+        deadline = time.monotonic() + timeout
+        with self._send_q.all_tasks_done:
+            while self._send_q.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Closing with %s messages still queued", self._send_q.unfinished_tasks)
+                    return
+                self._send_q.all_tasks_done.wait(remaining)
     
     def close(self) -> None:
-        """Close the connection to the Meshtastic node."""
+        """Close the connection to the Meshtastic node.
+        
+        Messages already queued, such as the bots' goodbyes, get up to
+        SEND_DRAIN_TIMEOUT to be written before the interface is closed.
+        """
+        self._drain_send_queue(SEND_DRAIN_TIMEOUT)
+        
         if self.interface:
             try:
                 self.interface.close()
                 logger.info("Closed connection to Meshtastic node")
             except Exception as e:
-                logger.error(f"Error closing connection: {str(e)}")
+                logger.error("Error closing connection: %s", e)
             
             self.interface = None
-            self.connected = False
\ No newline at end of file
+            self._set_connected(False)
+        
+        if self._handler_pool:
+            self._handler_pool.shutdown(wait=False)
+            self._handler_pool = None
\ No newline at end of file
@@ -1,22 +1,117 @@
 """Logging functionality for the Meshtastic client."""
 
-import os
+import atexit
+import functools
 import logging
+import pathlib
+import queue
+import threading
 import time
-from logging.handlers import RotatingFileHandler
-from typing import Dict, Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
 # Configure logging
-LOG_DIRECTORY = os.path.join(os.path.expanduser("~"), ".meshtastic_client", "logs")
+LOG_DIRECTORY: Optional[pathlib.Path] = None  # Resolved on first use by _log_dir()
 LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 COMMAND_LOG_FORMAT = "%(asctime)s [COMMAND] %(message)s"
 
-# Ensure log directory exists
-os.makedirs(LOG_DIRECTORY, exist_ok=True)
+# Formatters shared by all handlers
+_FORMATTER = logging.Formatter(LOG_FORMAT)
+_COMMAND_FORMATTER = logging.Formatter(COMMAND_LOG_FORMAT)
 
-# Store logger instances for reuse
-_loggers: Dict[str, logging.Logger] = {}
+# Package loggers propagate to this logger, which owns the handlers
+APP_LOGGER_NAME = "meshtastic_client"
 
+def _log_dir() -> pathlib.Path:
+    """Get the log directory, creating it on first use.
+    
+    Returns:
+        The path of the log directory
+    """
+    global LOG_DIRECTORY
+    
+    if LOG_DIRECTORY is None:
+        log_directory = _log_dir_path()
+        log_directory.mkdir(parents=True, exist_ok=True)
+        LOG_DIRECTORY = log_directory
+    
+    return LOG_DIRECTORY
+
+def _log_dir_path() -> pathlib.Path:
+    """Get the path of the log directory without creating it.
+    
+    Returns:
+        The path of the log directory
+    """
+    return LOG_DIRECTORY or pathlib.Path.home() / ".meshtastic_client" / "logs"
+
+
+class _LogFileHandler(RotatingFileHandler):
+    """Rotating file handler that creates the log directory when it first opens its file."""
+    
+    def __init__(self, file_name: str):
+        """Initialize the handler without touching the disk.
+        
+        Args:
+            file_name: The name of the log file inside the log directory
+        """
+        super().__init__(_log_dir_path() / file_name, maxBytes=1024*1024*10, backupCount=5, delay=True)
+    
+    def _open(self):
+        """Open the log file, creating the log directory first if needed."""
+        _log_dir()
+        return super()._open()
+
+
+class _OffloadHandler(QueueHandler):
+    """Queue handler that starts its background writer on the first record."""
+    
+    def __init__(self, handler: logging.Handler):
+        """Initialize the handler without starting the writer thread.
+        
+        Args:
+            handler: The handler doing the actual (slow) I/O
+        """
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        super().__init__(log_queue)
+        self.setLevel(handler.level)
+        self._listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        self._started = False
+        self._start_lock = threading.Lock()
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record, starting the writer thread if it isn't running yet.
+        
+        Args:
+            record: The record to write
+        """
+        if not self._started:
+            with self._start_lock:
+                if not self._started:
+                    self._listener.start()
+                    # Flush remaining records on interpreter exit
+                    atexit.register(self._listener.stop)
+                    self._started = True
+        
+        super().enqueue(record)
+
+def _offload(handler: logging.Handler) -> QueueHandler:
+    """Wrap a handler so its records are written by a background thread.
+    
+    The thread is only started once the first record is logged.
+    
+    Args:
+        handler: The handler doing the actual (slow) I/O
+        
+    Returns:
+        A handler that only enqueues records for the background thread
+    """
+    return _OffloadHandler(handler)
+
+# Serializes first-time logger configuration
+_configure_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance.
     
@@ -26,32 +121,34 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         A configured logger instance
     """
-    global _loggers
-    
-    if name in _loggers:
-        return _loggers[name]
-    
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    # Package modules share the application logger's handlers via propagation
+    if name.startswith(APP_LOGGER_NAME + "."):
+        get_logger(APP_LOGGER_NAME)
+        return logging.getLogger(name)
     
-    # Set up console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter(LOG_FORMAT)
-    console_handler.setFormatter(console_formatter)
-    
-    # Set up file handler
-    log_file = os.path.join(LOG_DIRECTORY, f"{name.split('.')[-1]}.log")
-    file_handler = RotatingFileHandler(log_file, maxBytes=1024*1024*10, backupCount=5)
-    file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter(LOG_FORMAT)
-    file_handler.setFormatter(file_formatter)
-    
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    with _configure_lock:
+        logger = logging.getLogger(name)
+        
+        # Don't add a second set of handlers to an already configured logger
+        if logger.handlers:
+            return logger
+        
+        logger.setLevel(logging.INFO)
+        
+        # Set up console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(_FORMATTER)
+        
+        # Set up file handler
+        file_handler = _LogFileHandler(f"{name.split('.')[-1]}.log")
+        file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(_FORMATTER)
+        
+        # Add handlers; file writes happen off the logging thread
+        logger.addHandler(console_handler)
+        logger.addHandler(_offload(file_handler))
     
-    _loggers[name] = logger
     return logger
 
 
@@ -60,22 +157,23 @@ class CommandLogger:
     
     def __init__(self):
         """Initialize the command logger."""
-        self.logger = logging.getLogger("meshtastic_client.commands")
+        self.logger = logging.getLogger(f"{APP_LOGGER_NAME}.commands")
         self.logger.setLevel(logging.INFO)
         
+        # Commands only go to their own log, not the application log
+        self.logger.propagate = False
+        
         # Remove any existing handlers
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
         
         # Set up file handler
-        log_file = os.path.join(LOG_DIRECTORY, "commands.log")
-        file_handler = RotatingFileHandler(log_file, maxBytes=1024*1024*10, backupCount=5)
+        file_handler = _LogFileHandler("commands.log")
         file_handler.setLevel(logging.INFO)
-        file_formatter = logging.Formatter(COMMAND_LOG_FORMAT)
-        file_handler.setFormatter(file_formatter)
+        file_handler.setFormatter(_COMMAND_FORMATTER)
         
-        # Add handler
-        self.logger.addHandler(file_handler)
+        # Add handler; file writes happen off the logging thread
+        self.logger.addHandler(_offload(file_handler))
     
     def log_command(self, command: str, channel: int, sender: str, success: bool, response: Optional[str] = None) -> None:
         """Log a command.
@@ -87,14 +185,38 @@ class CommandLogger:
             success: Whether the command was successful
             response: The response to the command, if any
         """
+        # Skip building the message entirely when nobody would see it
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         status = "SUCCESS" if success else "FAILED"
-        message = f"[{status}] Channel: {channel}, Sender: {sender}, Command: {command}"
         
         if response:
-            message += f", Response: {response}"
-        
-        self.logger.info(message)
+            self.logger.info("[%s] Channel: %s, Sender: %s, Command: %s, Response: %s",
+                             status, channel, sender, command, response)
+        else:
+            self.logger.info("[%s] Channel: %s, Sender: %s, Command: %s", status, channel, sender, command)
 
 
-# Create a global command logger instance
-command_logger = CommandLogger()
\ No newline at end of file
+@functools.lru_cache(maxsize=None)
+def get_command_logger() -> CommandLogger:
+    """Get the shared command logger, creating it on first use.
+    
+    Returns:
+        The global CommandLogger instance
+    """
+    return CommandLogger()
+
+
+def __getattr__(name: str):
+    """Build module attributes that are only created on first access.
+    
+    Args:
+        name: The attribute name
+        
+    Returns:
+        The shared CommandLogger for command_logger
+    """
+    if name == "command_logger":
+        return get_command_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
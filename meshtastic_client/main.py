@@ -2,9 +2,10 @@
 
 import os
 import argparse
-import time
+import asyncio
 import signal
 import sys
+import threading
 from typing import Optional
 
 from .core import MeshtasticClient
@@ -33,23 +34,33 @@ def parse_arguments():
     
     return parser.parse_args()
 
+async def connect_client(client: MeshtasticClient) -> bool:
+    """Connect the client to its node, retrying once on failure.
+    
+    Args:
+        client: The MeshtasticClient instance
+        
+    Returns:
+        True if the client is connected, False otherwise
+    """
+    if await client.connect_async():
+        return True
+    
+    logger.error(f"Failed to connect to Meshtastic node at {client.address}")
+    logger.info("Trying to reconnect...")
+    return await client.reconnect_async()
+
 def main():
     """Main entry point."""
     # Parse arguments
     args = parse_arguments()
     
-    # Create the client
-    client = MeshtasticClient(address=args.address)
+    # Create the client and connect without blocking on the network directly
+    client = MeshtasticClient(address=args.address, auto_connect=False)
     
-    # Check connection
-    if not client.connected:
-        logger.error(f"Failed to connect to Meshtastic node at {args.address}")
-        logger.info("Trying to reconnect...")
-        
-        # Try to reconnect once
-        if not client.reconnect():
-            logger.error("Reconnection failed. Please check the node address and try again.")
-            sys.exit(1)
+    if not asyncio.run(connect_client(client)):
+        logger.error("Reconnection failed. Please check the node address and try again.")
+        sys.exit(1)
     
     # Create managers
     channel_manager = ChannelManager(client)
@@ -80,24 +91,22 @@ def main():
     logger.info(f"Meshtastic Client started. Web UI available at http://{args.ui_host}:{args.ui_port}")
     
     # Set up signal handlers for graceful shutdown
+    shutdown = threading.Event()
+    
     def signal_handler(sig, frame):
-        logger.info("Shutting down...")
-        bots_manager.stop_all_bots()
-        client.close()
-        sys.exit(0)
+        shutdown.set()
     
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
-    # Keep the main thread alive
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        logger.info("Shutting down...")
-        bots_manager.stop_all_bots()
-        client.close()
-        sys.exit(0)
+    # Sleep until a shutdown signal arrives
+    shutdown.wait()
+    
+    logger.info("Shutting down...")
+    web_ui.stop()
+    bots_manager.stop_all_bots()
+    client.close()
+    sys.exit(0)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
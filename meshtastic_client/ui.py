@@ -1,31 +1,163 @@
 """Web UI for the Meshtastic client."""
 
-import os
+import asyncio
+import concurrent.futures
+import gzip
+import hashlib
+import platform
+import re
+import sys
 import threading
 import time
-from typing import Dict, Any, Optional
-from flask import Flask, render_template, request, jsonify, Response
-from flask_socketio import SocketIO
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import orjson
+import requests
+import socketio
+import uvicorn
+from a2wsgi import WSGIMiddleware
+from flask import Flask, abort, request, Response
+from requests.adapters import HTTPAdapter
 
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
-# Template directory
-TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+# Incoming messages are pushed to browsers in batches: a batch is sent when it
+# reaches MESSAGE_BATCH_SIZE messages or MESSAGE_BATCH_DELAY after its first one
+MESSAGE_BATCH_SIZE = 64
+MESSAGE_BATCH_DELAY = 0.05  # seconds
 
-# Get current directory
-current_dir = os.path.dirname(os.path.abspath(__file__))
+# A further message from a sender within BURST_WINDOW of its first one holds
+# the batch until the window ends, so a multi-packet burst renders at once
+BURST_WINDOW = 0.2  # seconds
 
-# Create templates directory if it doesn't exist
-os.makedirs(os.path.join(current_dir, "templates"), exist_ok=True)
+# Broadcasts go out to this many WebSocket clients at a time, yielding to
+# the event loop in between so other I/O isn't stalled behind a big fan-out
+BROADCAST_CHUNK_SIZE = 50
 
-# Create static directory if it doesn't exist
-os.makedirs(os.path.join(current_dir, "static"), exist_ok=True)
+# How often (seconds) changed UI state is pushed to browsers
+STATE_PUSH_INTERVAL = 1.0
+
+# How long (seconds) stop() waits for open connections to finish
+SHUTDOWN_TIMEOUT = 5.0
+
+# Worker threads serving the Flask routes behind the ASGI server
+WSGI_WORKERS = 10
+
+# Connection pool for requests made to the node's HTTP server
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 8
+HTTP_TIMEOUT = 5  # seconds
+
+# How long (seconds) polled API responses are served from cache. The bot
+# list is cached until BotsManager reports a change instead.
+STATUS_CACHE_TTL = 1.0
+CHANNELS_CACHE_TTL = 5.0
+
+# Oldest kernel (major, minor) the io_uring event loop is used on
+URING_MIN_KERNEL = (5, 11)
+
+# The page and its assets are served from memory, gzipped once at startup.
+# Their URLs aren't versioned, so browsers revalidate every load; the
+# ETag keeps that to a 304 until an upgrade changes the contents.
+ASSET_GZIP_LEVEL = 6
+ASSET_CACHE_CONTROL = 'no-cache'
+
+# Fixed API response bodies, serialized once
+_SUCCESS = orjson.dumps({'success': True})
+_FAILURE = orjson.dumps({'success': False})
+_ERR_NO_MESSAGE = orjson.dumps({'success': False, 'error': 'No message provided'})
+_ERR_NO_BOT_NAME = orjson.dumps({'success': False, 'error': 'No bot name provided'})
+
+# One encoding of an asset: (body, ETag, headers, headers for a 304 response)
+_AssetVariant = Tuple[bytes, str, Dict[str, str], Dict[str, str]]
+
+def _io_uring_supported() -> bool:
+    """Check whether the running kernel is recent enough for uringcore.
+    
+    Returns:
+        True on Linux 5.11 or newer, False otherwise
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    
+    match = re.match(r"(\d+)\.(\d+)", platform.release())
+    if not match:
+        return False
+    
+    return (int(match.group(1)), int(match.group(2))) >= URING_MIN_KERNEL
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, preferring uringcore, then uvloop.
+    
+    Returns:
+        A new event loop
+    """
+    if _io_uring_supported():
+        try:
+            import uringcore
+        except ImportError:
+            pass
+        else:
+            try:
+                # Use a private policy instance so the process-wide default is untouched
+                return uringcore.EventLoopPolicy().new_event_loop()
+            except Exception as e:
+                # e.g. io_uring blocked by seccomp or kernel.io_uring_disabled
+                logger.warning(f"io_uring event loop unavailable, falling back: {str(e)}")
+    
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    
+    return uvloop.new_event_loop()
+
+def _etag(body: bytes, suffix: str = "") -> str:
+    """Build a strong ETag from the contents of a response body.
+    
+    Args:
+        body: The response body
+        suffix: Appended to the hash, to tell encodings of the same body apart
+        
+    Returns:
+        The quoted ETag
+    """
+    return f'"{hashlib.sha256(body).hexdigest()[:16]}{suffix}"'
+
+def _is_running_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    """Check whether the calling thread is running the given event loop.
+    
+    Args:
+        loop: The event loop
+        
+    Returns:
+        True if called from a coroutine or callback on that loop
+    """
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+def _log_task_error(future: concurrent.futures.Future) -> None:
+    """Log the exception of a coroutine scheduled on the server's event loop, if any.
+    
+    Args:
+        future: The future returned by asyncio.run_coroutine_threadsafe()
+    """
+    if future.cancelled():
+        return
+    
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Error pushing messages to the Web UI: {str(error)}")
 
 class WebUI:
     """Web UI for the Meshtastic client."""
     
+    # Page and static files by name, as-is and gzipped; built once per process
+    _assets: Dict[str, Tuple[_AssetVariant, _AssetVariant]] = {}
+    
     def __init__(self, client, channel_manager, bots_manager, host: str = "127.0.0.1", port: int = 5000):
         """Initialize the web UI.
         
@@ -42,11 +174,38 @@ class WebUI:
         self.host = host
         self.port = port
         
-        # Create Flask app
-        self.app = Flask(__name__, 
-                          template_folder=os.path.join(current_dir, "templates"),
-                          static_folder=os.path.join(current_dir, "static"))
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*")
+        # Create Flask app; static files are served by our own route
+        self.app = Flask(__name__, static_folder=None)
+        # Events travel as MessagePack binary frames rather than JSON text
+        self.socketio = socketio.AsyncServer(async_mode="asgi", serializer="msgpack", cors_allowed_origins="*")
+        
+        # Socket.IO is served natively over ASGI; everything else goes to Flask
+        self.asgi_app = socketio.ASGIApp(self.socketio, other_asgi_app=WSGIMiddleware(self.app, workers=WSGI_WORKERS))
+        
+        # Event loop of the running server, used to emit from other threads
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Messages waiting to be pushed to WebSocket clients
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_lock = threading.Lock()
+        
+        # When each sender's burst window ends, oldest first, until when a
+        # timed flush waits for a burst in progress, and when the pending
+        # batch got its first message
+        self._burst_deadline: Dict[str, float] = {}
+        self._hold_until = 0.0
+        self._batch_started = 0.0
+        
+        # Pooled HTTP session, so repeated connection tests reuse the TCP connection
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+        self._http.mount('http://', adapter)
+        
+        # Set when the UI state changed and browsers need a fresh 'state' push
+        self._state_dirty = False
+        
+        # Serialized bodies of polled API responses, keyed by endpoint: (built at, version, body, headers)
+        self._response_cache: Dict[str, Tuple[float, int, bytes, Dict[str, str]]] = {}
         
         # Set up routes
         self._setup_routes()
@@ -57,46 +216,48 @@ class WebUI:
         # Register message handler for events
         self.client.register_message_handler(self._on_message_received)
         
-        # Thread for the web server
-        self.thread: Optional[threading.Thread] = None
+        # Push the new state to browsers when the node connects or drops
+        self.client.register_connection_handler(self._on_connection_changed)
         
-        # Create HTML templates
-        self._create_templates()
+        # Thread for the web server, and the server itself while it runs
+        self.thread: Optional[threading.Thread] = None
+        self._server: Optional[uvicorn.Server] = None
         
-        # Create static files
-        self._create_static_files()
+        # Build the index page and static files, unless an earlier instance already did
+        if not self._assets:
+            self._create_index_page()
+            self._create_static_files()
     
     def _setup_routes(self) -> None:
         """Set up the Flask routes."""
         
         @self.app.route('/')
-        def index() -> str:
-            """Render the index page."""
-            return render_template('index.html')
+        def index() -> Response:
+            """Serve the index page."""
+            return self._asset_response('index.html')
+        
+        @self.app.route('/static/<path:filename>')
+        def static_file(filename: str) -> Response:
+            """Serve a static file."""
+            if filename not in self._assets:
+                abort(404)
+            return self._asset_response(filename)
         
         @self.app.route('/api/status')
         def status() -> Response:
             """Return the client status."""
-            return jsonify({
-                'connected': self.client.connected,
-                'address': self.client.address
-            })
+            return self._cached_json('status', self._status_payload, ttl=STATUS_CACHE_TTL)
         
         @self.app.route('/api/channels')
         def channels() -> Response:
             """Return the list of channels."""
-            channels = self.channel_manager.list_channels()
-            return jsonify(channels)
+            return self._cached_json('channels', self.channel_manager.list_channels,
+                                     ttl=CHANNELS_CACHE_TTL, version=self.channel_manager.version)
         
         @self.app.route('/api/bots')
         def bots() -> Response:
             """Return the list of bots."""
-            bots = [{
-                'name': bot.name,
-                'channel': bot.channel,
-                'running': bot.running
-            } for bot in self.bots_manager.bots]
-            return jsonify(bots)
+            return self._cached_json('bots', self._bots_payload, version=self.bots_manager.version)
         
         @self.app.route('/api/send', methods=['POST'])
         def send() -> Response:
@@ -106,30 +267,30 @@ class WebUI:
             channel = data.get('channel', 0)
             
             if not message:
-                return jsonify({'success': False, 'error': 'No message provided'})
+                return self._json_bytes(_ERR_NO_MESSAGE)
             
             success = self.client.send_message(message, channel)
-            return jsonify({'success': success})
+            return self._json_bytes(_SUCCESS if success else _FAILURE)
         
         @self.app.route('/api/reconnect', methods=['POST'])
         def reconnect() -> Response:
             """Reconnect to the Meshtastic node."""
             success = self.client.reconnect()
-            return jsonify({'success': success})
+            self._response_cache.pop('channels', None)
+            self._mark_state_dirty()
+            return self._json_bytes(_SUCCESS if success else _FAILURE)
         
         @self.app.route('/api/test_connection', methods=['POST'])
         def test_connection() -> Response:
             """Test the connection to the Meshtastic node."""
-            import requests
-            
             try:
-                response = requests.get(f"http://{self.client.address}/hotspot-detect", timeout=5)
-                return jsonify({
+                response = self._http.get(f"http://{self.client.address}/hotspot-detect", timeout=HTTP_TIMEOUT)
+                return self._json({
                     'success': response.status_code == 200,
                     'status_code': response.status_code
                 })
             except Exception as e:
-                return jsonify({
+                return self._json({
                     'success': False,
                     'error': str(e)
                 })
@@ -142,39 +303,219 @@ class WebUI:
             psk = data.get('psk', None)
             
             success = self.channel_manager.create_test_channel(name, psk)
-            return jsonify({'success': success})
+            self._mark_state_dirty()
+            return self._json_bytes(_SUCCESS if success else _FAILURE)
+        
+        # Bot actions available through /api/bot/<action>
+        bot_actions = {
+            'start': self.bots_manager.start_bot,
+            'stop': self.bots_manager.stop_bot
+        }
         
-        @self.app.route('/api/start_bot', methods=['POST'])
-        def start_bot() -> Response:
-            """Start a bot."""
+        @self.app.route('/api/bot/<action>', methods=['POST'])
+        def bot_action(action: str) -> Response:
+            """Start or stop a bot."""
+            run_action = bot_actions.get(action)
+            if run_action is None:
+                abort(404)
+            
             data = request.json
             name = data.get('name', '')
             
             if not name:
-                return jsonify({'success': False, 'error': 'No bot name provided'})
+                return self._json_bytes(_ERR_NO_BOT_NAME)
             
-            success = self.bots_manager.start_bot(name)
-            return jsonify({'success': success})
+            success = run_action(name)
+            self._mark_state_dirty()
+            return self._json_bytes(_SUCCESS if success else _FAILURE)
         
-        @self.app.route('/api/stop_bot', methods=['POST'])
-        def stop_bot() -> Response:
-            """Stop a bot."""
-            data = request.json
-            name = data.get('name', '')
+        # Old per-action URLs
+        self.app.add_url_rule('/api/start_bot', 'start_bot', bot_action, methods=['POST'], defaults={'action': 'start'})
+        self.app.add_url_rule('/api/stop_bot', 'stop_bot', bot_action, methods=['POST'], defaults={'action': 'stop'})
+    
+    @classmethod
+    def _add_asset(cls, name: str, text: str, content_type: str) -> None:
+        """Store a page or static file in memory, along with its gzipped form.
+        
+        Args:
+            name: The file name it is served under
+            text: The file contents
+            content_type: The Content-Type to serve it with
+        """
+        body = text.encode('utf-8')
+        
+        # Headers are built once here, so serving is just a lookup
+        variants = []
+        for variant_body, etag, extra_headers in (
+                (body, _etag(body), {}),
+                (gzip.compress(body, ASSET_GZIP_LEVEL), _etag(body, '-gzip'), {'Content-Encoding': 'gzip'})):
+            not_modified_headers = {
+                'ETag': etag,
+                'Cache-Control': ASSET_CACHE_CONTROL,
+                'Vary': 'Accept-Encoding'
+            }
+            headers = dict(not_modified_headers, **extra_headers)
+            headers['Content-Type'] = content_type
+            headers['Content-Length'] = str(len(variant_body))
+            variants.append((variant_body, etag, headers, not_modified_headers))
+        
+        cls._assets[name] = (variants[0], variants[1])
+    
+    def _asset_response(self, name: str) -> Response:
+        """Build the response for a page or static file.
+        
+        Args:
+            name: The name the file was stored under
             
-            if not name:
-                return jsonify({'success': False, 'error': 'No bot name provided'})
+        Returns:
+            The response, gzipped if the browser accepts it, or a 304 if
+            the browser's copy is current
+        """
+        plain, gzipped = self._assets[name]
+        body, etag, headers, not_modified_headers = gzipped if 'gzip' in request.headers.get('Accept-Encoding', '') else plain
+        
+        if etag in request.headers.get('If-None-Match', ''):
+            return Response(status=304, headers=not_modified_headers)
+        
+        return Response(body, headers=headers)
+    
+    @staticmethod
+    def _json(payload: Any) -> Response:
+        """Build a JSON response.
+        
+        Args:
+            payload: The object to serialize
+            
+        Returns:
+            The JSON response
+        """
+        return Response(orjson.dumps(payload), mimetype='application/json')
+    
+    @staticmethod
+    def _json_bytes(body: bytes) -> Response:
+        """Build a JSON response from an already serialized body.
+        
+        Args:
+            body: The serialized JSON
+            
+        Returns:
+            The JSON response
+        """
+        return Response(body, mimetype='application/json')
+    
+    def _cached_json(self, key: str, build: Callable[[], Any], ttl: Optional[float] = None, version: int = 0) -> Response:
+        """Return a JSON response, reusing the serialized body while it is fresh.
+        
+        Browsers must revalidate the response on every use, and get a 304
+        while the body is unchanged.
+        
+        Args:
+            key: The cache key, usually the endpoint name
+            build: Callable producing the payload on a cache miss
+            ttl: How long (seconds) a serialized body stays valid, or None for no limit
+            version: Version of the underlying data; a different version is a miss
+            
+        Returns:
+            The JSON response, or a 304 if the browser's copy is current
+        """
+        now = time.monotonic()
+        entry = self._response_cache.get(key)
+        
+        if (entry is None or entry[1] != version
+                or (ttl is not None and now - entry[0] >= ttl)):
+            body = orjson.dumps(build())
+            entry = (now, version, body, {'ETag': _etag(body), 'Cache-Control': 'no-cache'})
+            self._response_cache[key] = entry
+        
+        headers = entry[3]
+        if headers['ETag'] in request.headers.get('If-None-Match', ''):
+            return Response(status=304, headers=headers)
+        
+        return Response(entry[2], mimetype='application/json', headers=headers)
+    
+    def _status_payload(self) -> Dict[str, Any]:
+        """Build the client status payload.
+        
+        Returns:
+            The connection state and node address
+        """
+        return {
+            'connected': self.client.connected,
+            'address': self.client.address
+        }
+    
+    def _bots_payload(self) -> List[Dict[str, Any]]:
+        """Build the bot list payload.
+        
+        Returns:
+            The name, channel and running state of every bot
+        """
+        return [{
+            'name': bot.name,
+            'channel': bot.channel,
+            'running': bot.running
+        } for bot in self.bots_manager.bots.values()]
+    
+    def _state_payload(self) -> Dict[str, Any]:
+        """Build the full UI state pushed to browsers.
+        
+        Returns:
+            The status, channels and bots payloads
+        """
+        return {
+            'status': self._status_payload(),
+            'channels': self.channel_manager.list_channels(),
+            'bots': self._bots_payload()
+        }
+    
+    def _mark_state_dirty(self) -> None:
+        """Have the state pump push the current state on its next tick."""
+        self._state_dirty = True
+    
+    async def _state_pump(self) -> None:
+        """Push the UI state to all WebSocket clients once per interval when it changed."""
+        loop = asyncio.get_running_loop()
+        pushed_versions = (self.bots_manager.version, self.channel_manager.version)
+        
+        while True:
+            await self.socketio.sleep(STATE_PUSH_INTERVAL)
+            
+            # Bots and channels may also change outside the UI; their versions catch that
+            versions = (self.bots_manager.version, self.channel_manager.version)
+            if not self._state_dirty and versions == pushed_versions:
+                continue
             
-            success = self.bots_manager.stop_bot(name)
-            return jsonify({'success': success})
+            self._state_dirty = False
+            pushed_versions = versions
+            
+            try:
+                # Listing channels may block, so build the state off the loop
+                state = await loop.run_in_executor(None, self._state_payload)
+                await self._broadcast('state', state)
+            except Exception as e:
+                logger.error(f"Error pushing UI state: {str(e)}")
+    
+    def _on_connection_changed(self, connected: bool) -> None:
+        """Handle the client connecting to or disconnecting from the node.
+        
+        Args:
+            connected: Whether the client is now connected
+        """
+        self._response_cache.pop('status', None)
+        self._response_cache.pop('channels', None)
+        self._mark_state_dirty()
     
     def _setup_socketio_events(self) -> None:
         """Set up the Socket.IO events."""
         
         @self.socketio.on('connect')
-        def handle_connect() -> None:
+        async def handle_connect(sid: str, environ: Dict[str, Any], auth: Optional[Dict[str, Any]] = None) -> None:
             """Handle client connection."""
             logger.info("WebSocket client connected")
+            
+            # Send the initial state; listing channels may block, so build it off the loop
+            state = await asyncio.get_running_loop().run_in_executor(None, self._state_payload)
+            await self.socketio.emit('state', state, to=sid)
     
     def _on_message_received(self, message: str, from_id: str, packet: Dict[str, Any]) -> None:
         """Handle incoming messages from the Meshtastic network.
@@ -184,39 +525,197 @@ class WebUI:
             from_id: The sender ID
             packet: The full packet information
         """
-        # Emit message to WebSocket clients
-        self.socketio.emit('message', {
+        loop = self._loop
+        if loop is None:
+            # The server isn't running, so there is nobody to push to
+            return
+        
+        item = {
             'text': message,
             'from': from_id,
             'channel': packet.get('channel', 0),
             'timestamp': time.time()
-        })
+        }
+        
+        now = time.monotonic()
+        with self._pending_lock:
+            # Windows open in time order, so the expired ones are at the front
+            deadlines = self._burst_deadline
+            while deadlines:
+                sender = next(iter(deadlines))
+                if deadlines[sender] > now:
+                    break
+                del deadlines[sender]
+            
+            if not self._pending:
+                self._batch_started = now
+            
+            deadline = deadlines.get(from_id)
+            if deadline is None:
+                # A lone message opens a window for its sender
+                deadlines[from_id] = now + BURST_WINDOW
+            elif deadline > self._hold_until:
+                # Part of a burst: hold the batch until the sender's window ends,
+                # but staggered bursts must not hold it past one window overall
+                self._hold_until = min(deadline, self._batch_started + BURST_WINDOW)
+            
+            # Every message joins the one batch, so arrival order is kept
+            self._pending.append(item)
+            pending_count = len(self._pending)
+        
+        # The first message of a batch arms the flush timer; a full batch goes out at once
+        if pending_count == 1:
+            self._schedule(self._flush_messages(MESSAGE_BATCH_DELAY), loop)
+        elif pending_count >= MESSAGE_BATCH_SIZE:
+            self._schedule(self._flush_messages(), loop)
+    
+    @staticmethod
+    def _schedule(coro: Any, loop: asyncio.AbstractEventLoop) -> None:
+        """Run a coroutine on the server's event loop from another thread.
+        
+        Args:
+            coro: The coroutine to run
+            loop: The server's event loop
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        future.add_done_callback(_log_task_error)
+    
+    async def _flush_messages(self, delay: float = 0) -> None:
+        """Emit all pending messages to WebSocket clients in a single event.
+        
+        Args:
+            delay: Seconds to wait before flushing, so more messages can join the
+                batch. A delayed flush also waits out a burst in progress.
+        """
+        if delay:
+            await asyncio.sleep(delay)
+            remaining = self._hold_until - time.monotonic()
+            while remaining > 0:
+                await asyncio.sleep(remaining)
+                remaining = self._hold_until - time.monotonic()
+        
+        with self._pending_lock:
+            batch = self._pending
+            self._pending = []
+        
+        if batch:
+            await self._broadcast('message_batch', batch)
+    
+    async def _broadcast(self, event: str, payload: Any) -> None:
+        """Emit an event to all WebSocket clients, a chunk of clients at a time.
+        
+        Args:
+            event: The event name
+            payload: The event data
+        """
+        try:
+            sids = [sid for sid, _ in self.socketio.manager.get_participants('/', None)]
+        except KeyError:
+            # python-socketio before 5.9 raises until the first browser connects
+            return
+        
+        if not sids:
+            return
+        
+        for start in range(0, len(sids), BROADCAST_CHUNK_SIZE):
+            if start:
+                # Let the loop service other connections between chunks
+                await asyncio.sleep(0)
+            await self.socketio.emit(event, payload, to=sids[start:start + BROADCAST_CHUNK_SIZE])
+    
+    async def serve(self) -> None:
+        """Run the web UI server on the current event loop until stop() is called.
+        
+        Callers that already run an event loop can schedule this with
+        asyncio.create_task() instead of using start().
+        """
+        # start() builds the server up front, so a stop() before we get here still lands
+        server = self._server
+        if server is None:
+            server = self._server = self._new_server()
+        
+        self._loop = asyncio.get_running_loop()
+        pump = self.socketio.start_background_task(self._state_pump)
+        try:
+            await server.serve()
+        finally:
+            pump.cancel()
+            self._loop = None
+            self._server = None
+    
+    def _new_server(self) -> uvicorn.Server:
+        """Build the uvicorn server for the ASGI app.
+        
+        Returns:
+            The server, not yet running
+        """
+        # uvicorn picks httptools and websockets automatically when installed
+        config = uvicorn.Config(self.asgi_app, host=self.host, port=self.port, log_level="warning",
+                                timeout_graceful_shutdown=SHUTDOWN_TIMEOUT)
+        return uvicorn.Server(config)
     
     def start(self) -> None:
-        """Start the web UI server."""
+        """Start the web UI server in a background thread."""
         if self.thread and self.thread.is_alive():
             logger.warning("Web UI is already running")
             return
         
+        self._server = self._new_server()
+        
         def run_server():
-            """Run the Flask server."""
-            self.socketio.run(self.app, host=self.host, port=self.port, debug=False, allow_unsafe_werkzeug=True)
+            """Run the server on its own event loop."""
+            loop = _new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.serve())
+            finally:
+                # Let background tasks (e.g. Socket.IO pings) unwind before closing
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.close()
         
-        self.thread = threading.Thread(target=run_server)
-        self.thread.daemon = True
+        self.thread = threading.Thread(target=run_server, name="web-ui")
         self.thread.start()
         
         logger.info(f"Web UI started at http://{self.host}:{self.port}")
     
+    async def _close_clients(self) -> None:
+        """Disconnect all Socket.IO clients, so open long-polls don't hold up shutdown."""
+        await self.socketio.shutdown()
+        if self.socketio.eio.sockets:
+            await self.socketio.eio.disconnect()
+    
     def stop(self) -> None:
-        """Stop the web UI server."""
-        if self.thread and self.thread.is_alive():
+        """Stop the web UI server and wait for it to shut down."""
+        server = self._server
+        if server is not None:
             logger.info("Stopping Web UI")
-            # There's no clean way to stop Flask directly, but since it's in a daemon thread,
-            # it will be stopped when the main program exits
+            
+            loop = self._loop
+            if loop is not None:
+                future = asyncio.run_coroutine_threadsafe(self._close_clients(), loop)
+                
+                # Waiting from the server's own loop would deadlock it
+                if not _is_running_loop(loop):
+                    try:
+                        future.result(SHUTDOWN_TIMEOUT)
+                    except Exception as e:
+                        logger.warning(f"Error disconnecting Web UI clients: {str(e)}")
+            
+            server.should_exit = True
+        
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=SHUTDOWN_TIMEOUT * 2)
+            if self.thread.is_alive():
+                logger.warning("Web UI did not shut down in time")
+        
+        self._http.close()
     
-    def _create_templates(self) -> None:
-        """Create the HTML templates."""
+    @classmethod
+    def _create_index_page(cls) -> None:
+        """Build the index page."""
         index_html = """<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -287,19 +786,17 @@ class WebUI:
         </div>
     </div>
     
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.0.1/socket.io.js"></script>
+    <script src="https://cdn.socket.io/4.7.5/socket.io.msgpack.min.js"></script>
     <script src="/static/script.js"></script>
 </body>
 </html>
 """
         
-        # Save index.html template
-        template_path = os.path.join(current_dir, "templates", "index.html")
-        with open(template_path, 'w') as f:
-            f.write(index_html)
+        cls._add_asset('index.html', index_html, 'text/html; charset=utf-8')
     
-    def _create_static_files(self) -> None:
-        """Create the static files."""
+    @classmethod
+    def _create_static_files(cls) -> None:
+        """Build the static files."""
         css = """/* Reset and base styles */
 * {
     margin: 0;
@@ -514,15 +1011,7 @@ const createChannelBtn = document.getElementById('create-channel-btn');
 function updateStatus() {
     fetch('/api/status')
         .then(response => response.json())
-        .then(data => {
-            if (data.connected) {
-                connectionStatus.textContent = `Connected to ${data.address}`;
-                connectionStatus.className = 'status connected';
-            } else {
-                connectionStatus.textContent = 'Disconnected';
-                connectionStatus.className = 'status disconnected';
-            }
-        })
+        .then(renderStatus)
         .catch(error => {
             console.error('Error fetching status:', error);
             connectionStatus.textContent = 'Error';
@@ -530,101 +1019,96 @@ function updateStatus() {
         });
 }
 
-// Load channels
-function loadChannels() {
-    fetch('/api/channels')
-        .then(response => response.json())
-        .then(channels => {
-            channelList.innerHTML = '';
-            messageChannel.innerHTML = '';
-            
-            if (channels.length === 0) {
-                channelList.innerHTML = '<div class="channel-item">No channels available</div>';
-                messageChannel.innerHTML = '<option value="0">Default (0)</option>';
-                return;
-            }
-            
-            channels.forEach(channel => {
-                const channelItem = document.createElement('div');
-                channelItem.className = 'channel-item';
-                channelItem.textContent = `${channel.name} (${channel.index})`;
-                channelList.appendChild(channelItem);
-                
-                const option = document.createElement('option');
-                option.value = channel.index;
-                option.textContent = `${channel.name} (${channel.index})`;
-                messageChannel.appendChild(option);
-            });
-            
-            // Add default channel if not in the list
-            if (!channels.some(channel => channel.index === 0)) {
-                const option = document.createElement('option');
-                option.value = 0;
-                option.textContent = 'Default (0)';
-                messageChannel.appendChild(option);
-            }
-        })
-        .catch(error => {
-            console.error('Error loading channels:', error);
-            channelList.innerHTML = '<div class="error">Error loading channels</div>';
-        });
+// Render client status
+function renderStatus(data) {
+    if (data.connected) {
+        connectionStatus.textContent = `Connected to ${data.address}`;
+        connectionStatus.className = 'status connected';
+    } else {
+        connectionStatus.textContent = 'Disconnected';
+        connectionStatus.className = 'status disconnected';
+    }
 }
 
-// Load bots
-function loadBots() {
-    fetch('/api/bots')
-        .then(response => response.json())
-        .then(bots => {
-            botList.innerHTML = '';
-            
-            if (bots.length === 0) {
-                botList.innerHTML = '<div class="bot-item">No bots available</div>';
-                return;
-            }
-            
-            bots.forEach(bot => {
-                const botItem = document.createElement('div');
-                botItem.className = 'bot-item';
-                
-                const botInfo = document.createElement('div');
-                botInfo.textContent = `${bot.name} (Channel: ${bot.channel})`;
-                botItem.appendChild(botInfo);
-                
-                const botStatus = document.createElement('div');
-                botStatus.textContent = bot.running ? 'Running' : 'Stopped';
-                botStatus.style.color = bot.running ? '#155724' : '#721c24';
-                botItem.appendChild(botStatus);
-                
-                const botControls = document.createElement('div');
-                botControls.style.marginTop = '10px';
-                
-                const startBtn = document.createElement('button');
-                startBtn.textContent = 'Start';
-                startBtn.disabled = bot.running;
-                startBtn.addEventListener('click', () => startBot(bot.name));
-                
-                const stopBtn = document.createElement('button');
-                stopBtn.textContent = 'Stop';
-                stopBtn.className = 'danger';
-                stopBtn.disabled = !bot.running;
-                stopBtn.addEventListener('click', () => stopBot(bot.name));
-                
-                botControls.appendChild(startBtn);
-                botControls.appendChild(document.createTextNode(' '));
-                botControls.appendChild(stopBtn);
-                
-                botItem.appendChild(botControls);
-                botList.appendChild(botItem);
-            });
-        })
-        .catch(error => {
-            console.error('Error loading bots:', error);
-            botList.innerHTML = '<div class="error">Error loading bots</div>';
-        });
+// Render the channel list
+function renderChannels(channels) {
+    channelList.innerHTML = '';
+    messageChannel.innerHTML = '';
+    
+    if (channels.length === 0) {
+        channelList.innerHTML = '<div class="channel-item">No channels available</div>';
+        messageChannel.innerHTML = '<option value="0">Default (0)</option>';
+        return;
+    }
+    
+    channels.forEach(channel => {
+        const channelItem = document.createElement('div');
+        channelItem.className = 'channel-item';
+        channelItem.textContent = `${channel.name} (${channel.index})`;
+        channelList.appendChild(channelItem);
+        
+        const option = document.createElement('option');
+        option.value = channel.index;
+        option.textContent = `${channel.name} (${channel.index})`;
+        messageChannel.appendChild(option);
+    });
+    
+    // Add default channel if not in the list
+    if (!channels.some(channel => channel.index === 0)) {
+        const option = document.createElement('option');
+        option.value = 0;
+        option.textContent = 'Default (0)';
+        messageChannel.appendChild(option);
+    }
 }
 
-// Add a message to the message list
-function addMessage(message) {
+// Render the bot list
+function renderBots(bots) {
+    botList.innerHTML = '';
+    
+    if (bots.length === 0) {
+        botList.innerHTML = '<div class="bot-item">No bots available</div>';
+        return;
+    }
+    
+    bots.forEach(bot => {
+        const botItem = document.createElement('div');
+        botItem.className = 'bot-item';
+        
+        const botInfo = document.createElement('div');
+        botInfo.textContent = `${bot.name} (Channel: ${bot.channel})`;
+        botItem.appendChild(botInfo);
+        
+        const botStatus = document.createElement('div');
+        botStatus.textContent = bot.running ? 'Running' : 'Stopped';
+        botStatus.style.color = bot.running ? '#155724' : '#721c24';
+        botItem.appendChild(botStatus);
+        
+        const botControls = document.createElement('div');
+        botControls.style.marginTop = '10px';
+        
+        const startBtn = document.createElement('button');
+        startBtn.textContent = 'Start';
+        startBtn.disabled = bot.running;
+        startBtn.addEventListener('click', () => startBot(bot.name));
+        
+        const stopBtn = document.createElement('button');
+        stopBtn.textContent = 'Stop';
+        stopBtn.className = 'danger';
+        stopBtn.disabled = !bot.running;
+        stopBtn.addEventListener('click', () => stopBot(bot.name));
+        
+        botControls.appendChild(startBtn);
+        botControls.appendChild(document.createTextNode(' '));
+        botControls.appendChild(stopBtn);
+        
+        botItem.appendChild(botControls);
+        botList.appendChild(botItem);
+    });
+}
+
+// Build the list element for a message
+function buildMessageItem(message) {
     const item = document.createElement('div');
     item.className = 'message-item';
     
@@ -646,7 +1130,22 @@ function addMessage(message) {
     
     item.appendChild(meta);
     item.appendChild(content);
-    messageList.appendChild(item);
+    return item;
+}
+
+// Add a message to the message list
+function addMessage(message) {
+    messageList.appendChild(buildMessageItem(message));
+    
+    // Scroll to bottom
+    messageList.scrollTop = messageList.scrollHeight;
+}
+
+// Add several messages to the message list with a single DOM update
+function addMessages(messages) {
+    const fragment = document.createDocumentFragment();
+    messages.forEach(message => fragment.appendChild(buildMessageItem(message)));
+    messageList.appendChild(fragment);
     
     // Scroll to bottom
     messageList.scrollTop = messageList.scrollHeight;
@@ -669,8 +1168,6 @@ function reconnect() {
                 connectionStatus.textContent = 'Reconnection failed';
                 connectionStatus.className = 'status disconnected';
             }
-            updateStatus();
-            loadChannels();
         })
         .catch(error => {
             console.error('Error reconnecting:', error);
@@ -777,7 +1274,6 @@ function createTestChannel() {
         .then(data => {
             if (data.success) {
                 alert(`Channel '${name}' created successfully`);
-                loadChannels();
             } else {
                 alert('Failed to create channel');
             }
@@ -794,7 +1290,7 @@ function createTestChannel() {
 
 // Start a bot
 function startBot(name) {
-    fetch('/api/start_bot', {
+    fetch('/api/bot/start', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
@@ -805,9 +1301,7 @@ function startBot(name) {
     })
         .then(response => response.json())
         .then(data => {
-            if (data.success) {
-                loadBots();
-            } else {
+            if (!data.success) {
                 alert(`Failed to start bot '${name}'`);
             }
         })
@@ -819,7 +1313,7 @@ function startBot(name) {
 
 // Stop a bot
 function stopBot(name) {
-    fetch('/api/stop_bot', {
+    fetch('/api/bot/stop', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
@@ -830,9 +1324,7 @@ function stopBot(name) {
     })
         .then(response => response.json())
         .then(data => {
-            if (data.success) {
-                loadBots();
-            } else {
+            if (!data.success) {
                 alert(`Failed to stop bot '${name}'`);
             }
         })
@@ -851,6 +1343,15 @@ socket.on('message', (message) => {
     addMessage(message);
 });
 
+socket.on('message_batch', addMessages);
+
+// The server pushes the full state on connect and whenever it changes
+socket.on('state', (state) => {
+    renderStatus(state.status);
+    renderChannels(state.channels);
+    renderBots(state.bots);
+});
+
 // Event listeners
 reconnectBtn.addEventListener('click', reconnect);
 testConnectionBtn.addEventListener('click', testConnection);
@@ -862,22 +1363,9 @@ messageText.addEventListener('keypress', (event) => {
 });
 createChannelBtn.addEventListener('click', createTestChannel);
 
-// Initial load
-updateStatus();
-loadChannels();
-loadBots();
-
-// Refresh status and channels periodically
-setInterval(updateStatus, 10000);
-setInterval(loadChannels, 30000);
-setInterval(loadBots, 30000);
+// Fallback in case a state push is missed
+setInterval(updateStatus, 60000);
 """
         
-        # Save static files
-        css_path = os.path.join(current_dir, "static", "style.css")
-        with open(css_path, 'w') as f:
-            f.write(css)
-        
-        js_path = os.path.join(current_dir, "static", "script.js")
-        with open(js_path, 'w') as f:
-            f.write(js)
\ No newline at end of file
+        cls._add_asset('style.css', css, 'text/css; charset=utf-8')
+        cls._add_asset('script.js', js, 'text/javascript; charset=utf-8')
\ No newline at end of file
@@ -10,8 +10,15 @@ setup(
         "requests>=2.28.2",
         "python-dotenv>=1.0.0",
         "rich>=13.0.0",
-        "flask-socketio>=5.3.0",
+        "python-socketio>=5.8.0",
+        "uvicorn[standard]>=0.22.0",
+        "a2wsgi>=1.7.0",
+        "orjson>=3.8.0",
+        "msgpack>=1.0.0",
     ],
+    extras_require={
+        "uring": ['uringcore; sys_platform=="linux"'],
+    },
     entry_points={
         "console_scripts": [
             "meshtastic-client=meshtastic_client.main:main",
@@ -0,0 +1,135 @@
+"""Tests for the bot module."""
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from meshtastic_client.bot import HelloWorldBot, TestBot, get_default_scheduler
+
+
+def _hello_waiter(client):
+    """Make the mock client set an event whenever a periodic hello is sent."""
+    sent = threading.Event()
+    
+    def send_message(message, channel=0):
+        if message.startswith("Hello everyone!"):
+            sent.set()
+        return True
+    
+    client.send_message.side_effect = send_message
+    return sent
+
+
+class TestHelloWorldBot(unittest.TestCase):
+    """Test the HelloWorldBot class."""
+    
+    def test_periodic_hello_without_manager(self):
+        """Test that a bot built without a BotsManager still runs its periodic tasks."""
+        client = MagicMock()
+        sent = _hello_waiter(client)
+        bot = HelloWorldBot(client, MagicMock())
+        
+        # Test start
+        bot.start()
+        try:
+            # Verify
+            self.assertTrue(sent.wait(2.0))
+            self.assertIs(bot.scheduler, get_default_scheduler())
+        finally:
+            bot.stop()
+    
+    def test_interval_change_takes_effect_at_once(self):
+        """Test that /interval reschedules the pending hello instead of waiting out the old interval."""
+        client = MagicMock()
+        sent = _hello_waiter(client)
+        bot = HelloWorldBot(client, MagicMock())
+        bot.hello_interval = 3600
+        
+        bot.start()
+        try:
+            # The first hello goes out at once; the next one is an hour away
+            self.assertTrue(sent.wait(2.0))
+            sent.clear()
+            
+            # Test interval change
+            bot._handle_message("/interval 1", "!abcd", {'channel': 0})
+            
+            # Verify
+            self.assertTrue(sent.wait(3.0))
+        finally:
+            bot.stop()
+
+    def test_zero_interval_rejected(self):
+        """Test that /interval 0 is refused and a zero interval can't spin the scheduler."""
+        client = MagicMock()
+        hellos = []
+        client.send_message.side_effect = lambda message, channel=0: hellos.append(message) if message.startswith("Hello everyone!") else None
+        bot = HelloWorldBot(client, MagicMock())
+        
+        # Test interval command
+        bot._handle_message("/interval 0", "!abcd", {'channel': 0})
+        self.assertEqual(bot.hello_interval, 60)
+        
+        # Even when set directly, runs stay at least MIN_PERIODIC_INTERVAL apart
+        bot.hello_interval = 0
+        bot.start()
+        try:
+            time.sleep(0.5)
+        finally:
+            bot.stop()
+        
+        # Verify
+        self.assertEqual(len(hellos), 1)
+
+class TestTestBot(unittest.TestCase):
+    """Test the TestBot class."""
+    
+    def test_latency_test_times_acks_off_the_handler_thread(self):
+        """Test that latency probes are timed by their ACK and the test runs on its own thread."""
+        client = MagicMock()
+        probes = []
+        
+        def send_message_wait(message, channel=0, on_ack=None):
+            probes.append((message, threading.current_thread().name))
+            on_ack({'decoded': {'routing': {'errorReason': 'NONE'}}})
+            return True
+        
+        client.send_message_wait.side_effect = send_message_wait
+        bot = TestBot(client, MagicMock())
+        
+        # Test latency command; it returns before the test finishes
+        bot._handle_message("/test latency", "!abcd", {'channel': 0})
+        bot._latency_lock.acquire(timeout=2.0)
+        
+        # Verify
+        self.assertEqual(len(probes), TestBot.LATENCY_SAMPLES)
+        self.assertEqual(len({message for message, _ in probes}), TestBot.LATENCY_SAMPLES)
+        self.assertTrue(all(message.startswith("LATENCY-") for message, _ in probes))
+        self.assertNotIn(threading.current_thread().name, {name for _, name in probes})
+        self.assertTrue(bot.last_test_results["latency"].startswith("Latency: avg="))
+    
+    def test_latency_test_reports_naks_as_failure(self):
+        """Test that probes the mesh NAKs don't count as answered."""
+        client = MagicMock()
+        
+        def send_message_wait(message, channel=0, on_ack=None):
+            on_ack({'decoded': {'routing': {'errorReason': 'MAX_RETRANSMIT'}}})
+            return True
+        
+        client.send_message_wait.side_effect = send_message_wait
+        bot = TestBot(client, MagicMock())
+        
+        # Test latency test
+        bot._run_latency_test()
+        
+        # Verify
+        self.assertEqual(bot.last_test_results["latency"], "Latency test failed - no ACKs received")
+
+if __name__ == '__main__':
+    unittest.main()
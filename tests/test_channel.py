@@ -0,0 +1,75 @@
+"""Tests for the channel module."""
+
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from meshtastic_client.channel import ChannelManager
+
+
+def _make_client(active_slots):
+    """Create a mock client whose node reports the given slot states."""
+    client = MagicMock()
+    client.connected = True
+    client.interface.getChannelSettings.return_value.settings = [
+        MagicMock(active=active) for active in active_slots
+    ]
+    return client
+
+
+class TestChannelManager(unittest.TestCase):
+    """Test the ChannelManager class."""
+    
+    def test_create_channels_reuses_settings_snapshot(self):
+        """Test that consecutive creates take distinct slots with a single settings fetch."""
+        # Set up a node with slot 0 in use
+        client = _make_client([True, False, False])
+        manager = ChannelManager(client)
+        
+        # Create two channels
+        self.assertTrue(manager.create_test_channel("a", "key"))
+        self.assertTrue(manager.create_test_channel("b", "key"))
+        
+        # Verify
+        client.interface.getChannelSettings.assert_called_once_with()
+        indices = [call.args[0] for call in client.interface.setChannelSettings.call_args_list]
+        self.assertEqual(indices, [1, 2])
+        self.assertEqual(manager.version, 2)
+        
+        # The settings returned by the node are not modified
+        slots = client.interface.getChannelSettings.return_value.settings
+        self.assertEqual([slot.active for slot in slots], [True, False, False])
+    
+    def test_create_channel_fails_when_table_full(self):
+        """Test that a full channel table is reported instead of overwriting slot 0."""
+        # Set up a node with every slot in use
+        client = _make_client([True, True, True])
+        manager = ChannelManager(client)
+        
+        # Test create
+        result = manager.create_test_channel("a", "key")
+        
+        # Verify
+        self.assertFalse(result)
+        client.interface.setChannelSettings.assert_not_called()
+
+    def test_reconnect_invalidates_name_lookup(self):
+        """Test that reconnecting to the node drops the cached channel name to index map."""
+        client = _make_client([True, False])
+        manager = ChannelManager(client)
+        manager.create_test_channel("a", "key")
+        
+        # Test reconnect notification
+        on_connection_changed = client.register_connection_handler.call_args.args[0]
+        on_connection_changed(True)
+        
+        # Verify
+        self.assertEqual(manager._name_to_index, {})
+        self.assertIsNone(manager._settings_cache)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -4,78 +4,211 @@ import unittest
 from unittest.mock import MagicMock, patch
 import sys
 import os
+import threading
 
 # Add the parent directory to the path so we can import the package
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from meshtastic_client import core
 from meshtastic_client.core import MeshtasticClient
 
 
 class TestMeshtasticClient(unittest.TestCase):
     """Test the MeshtasticClient class."""
     
-    @patch('meshtastic_client.core.meshtastic.tcp_interface.TCPInterface')
-    @patch('meshtastic_client.core.requests.get')
-    def test_connect_success(self, mock_requests_get, mock_interface):
+    @classmethod
+    def setUpClass(cls):
+        """Resolve the patch targets once for all tests."""
+        cls._tcp = core.meshtastic.tcp_interface
+        cls._time = core.time
+    
+    def test_connect_success(self):
         """Test successful connection."""
-        # Set up mocks
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_requests_get.return_value = mock_response
-        
-        # Create client with auto_connect=False
-        client = MeshtasticClient(auto_connect=False)
-        
-        # Test connect
-        result = client.connect()
-        
-        # Verify
-        self.assertTrue(result)
-        self.assertTrue(client.connected)
-        mock_interface.assert_called_once_with('10.0.0.5')
-        mock_requests_get.assert_called_once_with('http://10.0.0.5/hotspot-detect', timeout=5)
+        with patch.object(self._tcp, 'TCPInterface') as mock_interface:
+            # Create client with auto_connect=False
+            client = MeshtasticClient(auto_connect=False)
+            
+            # Test connect
+            result = client.connect()
+            
+            # Verify
+            self.assertTrue(result)
+            self.assertTrue(client.connected)
+            mock_interface.assert_called_once_with('10.0.0.5', **core._TCP_INTERFACE_KWARGS)
     
-    @patch('meshtastic_client.core.meshtastic.tcp_interface.TCPInterface')
-    @patch('meshtastic_client.core.requests.get')
-    def test_connect_failure(self, mock_requests_get, mock_interface):
+    def test_connect_failure(self):
         """Test failed connection."""
-        # Set up mocks
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_requests_get.return_value = mock_response
-        
-        # Create client with auto_connect=False
-        client = MeshtasticClient(auto_connect=False)
-        
-        # Test connect
-        result = client.connect()
-        
-        # Verify
-        self.assertFalse(result)
-        self.assertFalse(client.connected)
+        with patch.object(self._tcp, 'TCPInterface') as mock_interface, patch.object(self._time, 'sleep'):
+            # Set up mocks: the node never reports its info
+            mock_interface.return_value.myInfo = None
+            
+            # Create client with auto_connect=False
+            client = MeshtasticClient(auto_connect=False)
+            
+            # Test connect
+            result = client.connect()
+            
+            # Verify
+            self.assertFalse(result)
+            self.assertFalse(client.connected)
+            self.assertIsNone(client.interface)
+            mock_interface.return_value.close.assert_called_once_with()
     
-    @patch('meshtastic_client.core.meshtastic.tcp_interface.TCPInterface')
-    @patch('meshtastic_client.core.requests.get')
-    def test_send_message(self, mock_requests_get, mock_interface):
+    def test_send_message(self):
         """Test sending a message."""
-        # Set up mocks
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_requests_get.return_value = mock_response
-        
-        mock_interface_instance = MagicMock()
-        mock_interface.return_value = mock_interface_instance
+        with patch.object(self._tcp, 'TCPInterface') as mock_interface:
+            # Set up mocks
+            mock_interface_instance = MagicMock()
+            mock_interface.return_value = mock_interface_instance
+            
+            # Create client
+            client = MeshtasticClient()
+            
+            # Test send_message
+            result = client.send_message("Hello, world!", 0)
+            client._send_q.join()
+            
+            # Verify
+            self.assertTrue(result)
+            mock_interface_instance.sendText.assert_called_once_with("Hello, world!", wantAck=True, channelIndex=0)
+
+    
+    def test_reconnect_keeps_live_connection(self):
+        """Test that reconnect reuses a connection that still answers heartbeats."""
+        with patch.object(self._tcp, 'TCPInterface', autospec=True) as mock_interface:
+            # Set up mocks: autospec only provides methods the real interface has
+            mock_interface.return_value.myInfo = MagicMock()
+            mock_interface.return_value.isConnected = threading.Event()
+            mock_interface.return_value.isConnected.set()
+            
+            # Create client
+            client = MeshtasticClient()
+            
+            # Test reconnect
+            result = client.reconnect()
+            
+            # Verify
+            self.assertTrue(result)
+            self.assertTrue(client.connected)
+            mock_interface.assert_called_once_with('10.0.0.5', **core._TCP_INTERFACE_KWARGS)
+            mock_interface.return_value.sendHeartbeat.assert_called_once_with()
+            mock_interface.return_value.close.assert_not_called()
+    
+    def test_reconnect_rebuilds_lost_connection(self):
+        """Test that reconnect rebuilds a connection the interface reported lost."""
+        with patch.object(self._tcp, 'TCPInterface', autospec=True) as mock_interface, patch.object(self._time, 'sleep'):
+            # Set up mocks: the node info survives the drop, but isConnected is cleared
+            mock_interface.return_value.myInfo = MagicMock()
+            mock_interface.return_value.isConnected = threading.Event()
+            
+            # Create client
+            client = MeshtasticClient()
+            
+            # Test reconnect
+            result = client.reconnect()
+            
+            # Verify
+            self.assertTrue(result)
+            self.assertEqual(mock_interface.call_count, 2)
+            mock_interface.return_value.sendHeartbeat.assert_not_called()
+            mock_interface.return_value.close.assert_called_once_with()
+    
+    def test_connection_handler_notified_on_change(self):
+        """Test that connection handlers only see actual state changes."""
+        with patch.object(self._tcp, 'TCPInterface'):
+            # Create client with a connection handler
+            client = MeshtasticClient(auto_connect=False)
+            handler = MagicMock()
+            client.register_connection_handler(handler)
+            
+            # Connect, reconnect over the live link, then close
+            client.connect()
+            client.reconnect()
+            client.close()
+            
+            # Verify
+            self.assertEqual([call.args for call in handler.call_args_list], [(True,), (False,)])
+    
+    def test_close_drains_send_queue(self):
+        """Test that close writes out queued messages before closing the interface."""
+        with patch.object(self._tcp, 'TCPInterface') as mock_interface:
+            # Create client
+            client = MeshtasticClient()
+            
+            # Queue a goodbye and close straight away
+            client.send_message("Goodbye!", 0)
+            client.close()
+            
+            # Verify
+            calls = [call[0] for call in mock_interface.return_value.mock_calls if call[0] in ('sendText', 'close')]
+            self.assertEqual(calls, ['sendText', 'close'])
+    
+    def test_echo_command(self):
+        """Test that the echo command replies with the rest of the message."""
+        with patch.object(self._tcp, 'TCPInterface') as mock_interface:
+            # Create client
+            client = MeshtasticClient()
+            
+            # Test echo command
+            client._handle_command("/echo hello  mesh", 1, "!abcd")
+            client._send_q.join()
+            
+            # Verify
+            mock_interface.return_value.sendText.assert_called_once_with("Echo: hello  mesh", wantAck=True, channelIndex=1)
+
+    def test_send_messages_batch_counts_queued_messages(self):
+        """Test that a batch cut short by a full send queue reports the messages actually queued."""
+        with patch.object(self._tcp, 'TCPInterface'):
+            # Create client with a queue that only takes two payloads
+            client = MeshtasticClient(auto_connect=False)
+            client.connected = True
+            client.interface = MagicMock()
+            client._send_q = core.queue.Queue(maxsize=2)
+            
+            # Test batch of three messages that each fill a packet
+            message = "X" * core.MAX_PAYLOAD_BYTES
+            result = client.send_messages_batch([message, message, message], 0)
+            
+            # Verify
+            self.assertEqual(result, 2)
+            self.assertEqual(client._send_q.qsize(), 2)
+
+
+class TestPayloadPacking(unittest.TestCase):
+    """Test splitting and packing outgoing text into payloads."""
+    
+    def test_split_text_keeps_multibyte_characters_whole(self):
+        """Test that a cut landing inside a multi-byte character moves before it."""
+        # Each 'é' is two bytes, so a 5-byte limit would cut the third one in half
+        pieces = core._split_text("é" * 5, 5)
         
-        # Create client
-        client = MeshtasticClient()
+        # Verify
+        self.assertEqual(pieces, ["éé", "éé", "é"])
+        self.assertEqual("".join(pieces), "é" * 5)
+    
+    def test_split_text_short_and_empty(self):
+        """Test that text within the limit, including empty text, is a single piece."""
+        self.assertEqual(core._split_text("abc", 5), ["abc"])
+        self.assertEqual(core._split_text("", 5), [""])
+    
+    def test_pack_payloads_joins_messages_that_fit(self):
+        """Test that messages share a payload while they fit and count the messages each completes."""
+        payloads = core._pack_payloads(["aaaa", "bbbb", "cccc"], 9)
         
-        # Test send_message
-        result = client.send_message("Hello, world!", 0)
+        # Verify
+        self.assertEqual(payloads, [("aaaa\nbbbb", 2), ("cccc", 1)])
+    
+    def test_pack_payloads_counts_split_message_once(self):
+        """Test that a message split across payloads is counted with its last piece."""
+        payloads = core._pack_payloads(["a" * 12, "b"], 5)
         
         # Verify
-        self.assertTrue(result)
-        mock_interface_instance.sendText.assert_called_once_with("Hello, world!", wantAck=True, channelIndex=0)
-
+        self.assertEqual(payloads, [("aaaaa", 0), ("aaaaa", 0), ("aa\nb", 2)])
+    
+    def test_pack_payloads_keeps_empty_messages(self):
+        """Test that empty messages are sent rather than dropped."""
+        self.assertEqual(core._pack_payloads([""], 5), [("", 1)])
+        self.assertEqual(core._pack_payloads(["", "a"], 5), [("\na", 2)])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,277 @@
+"""Tests for the ui module."""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+import os
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import requests
+
+from meshtastic_client import ui
+
+
+class TestNewEventLoop(unittest.TestCase):
+    """Test the event loop selection."""
+    
+    def test_falls_back_when_io_uring_is_blocked(self):
+        """Test that a uringcore loop that can't be created falls back to another loop."""
+        uringcore = MagicMock()
+        uringcore.EventLoopPolicy.return_value.new_event_loop.side_effect = OSError("Operation not permitted")
+        
+        with patch.dict(sys.modules, {'uringcore': uringcore}), patch.object(ui, '_io_uring_supported', return_value=True):
+            loop = ui._new_event_loop()
+        
+        # Verify
+        try:
+            self.assertIsInstance(loop, asyncio.AbstractEventLoop)
+        finally:
+            loop.close()
+
+def _make_ui():
+    """Create a WebUI around mock client, channel and bot managers."""
+    client = MagicMock()
+    client.connected = True
+    client.address = "10.0.0.5"
+    channel_manager = MagicMock()
+    channel_manager.version = 0
+    channel_manager.list_channels.return_value = [{'index': 0, 'name': 'Primary'}]
+    bots_manager = MagicMock()
+    bots_manager.version = 0
+    bots_manager.bots = {}
+    bots_manager.start_bot.return_value = True
+    bots_manager.stop_bot.return_value = True
+    return ui.WebUI(client, channel_manager, bots_manager)
+
+
+class TestWebUIRoutes(unittest.TestCase):
+    """Test the web UI's HTTP routes."""
+    
+    def setUp(self):
+        """Create a web UI and a Flask test client for it."""
+        self.web_ui = _make_ui()
+        self.http = self.web_ui.app.test_client()
+    
+    def tearDown(self):
+        """Release the web UI's HTTP session."""
+        self.web_ui.stop()
+    
+    def test_channels_cached_until_version_changes(self):
+        """Test that channels are listed once per channel manager version."""
+        channel_manager = self.web_ui.channel_manager
+        
+        # Two requests at the same version share one listing
+        first = self.http.get('/api/channels')
+        second = self.http.get('/api/channels')
+        
+        # Verify
+        self.assertEqual(first.get_json(), [{'index': 0, 'name': 'Primary'}])
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(channel_manager.list_channels.call_count, 1)
+        
+        # A new version is a cache miss
+        channel_manager.version += 1
+        self.http.get('/api/channels')
+        self.assertEqual(channel_manager.list_channels.call_count, 2)
+    
+    def test_status_cache_expires(self):
+        """Test that the status response is rebuilt once its TTL has passed."""
+        self.assertTrue(self.http.get('/api/status').get_json()['connected'])
+        
+        # Within the TTL the cached body is served
+        self.web_ui.client.connected = False
+        self.assertTrue(self.http.get('/api/status').get_json()['connected'])
+        
+        # Verify
+        with patch.object(ui, 'STATUS_CACHE_TTL', 0):
+            self.assertFalse(self.http.get('/api/status').get_json()['connected'])
+    
+    def test_api_etag_not_modified(self):
+        """Test that a current ETag gets a 304 and a stale one the full body."""
+        response = self.http.get('/api/bots')
+        etag = response.headers['ETag']
+        
+        # Verify
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        self.assertEqual(self.http.get('/api/bots', headers={'If-None-Match': etag}).status_code, 304)
+        
+        stale = self.http.get('/api/bots', headers={'If-None-Match': '"stale"'})
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale.get_json(), [])
+    
+    def test_assets_gzip_and_etag(self):
+        """Test that assets are gzipped on request and revalidate with their ETag."""
+        plain = self.http.get('/static/script.js')
+        gzipped = self.http.get('/static/script.js', headers={'Accept-Encoding': 'gzip, deflate'})
+        
+        # Verify
+        self.assertEqual(plain.status_code, 200)
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertEqual(gzipped.headers['Content-Encoding'], 'gzip')
+        self.assertNotEqual(plain.headers['ETag'], gzipped.headers['ETag'])
+        
+        not_modified = self.http.get('/static/script.js', headers={'If-None-Match': plain.headers['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.data, b'')
+        
+        self.assertEqual(self.http.get('/static/missing.js').status_code, 404)
+    
+    def test_bot_actions(self):
+        """Test that /api/bot/<action> and the old URLs dispatch to the bots manager."""
+        bots_manager = self.web_ui.bots_manager
+        
+        responses = [
+            self.http.post('/api/bot/start', json={'name': 'HelloBot'}),
+            self.http.post('/api/bot/stop', json={'name': 'HelloBot'}),
+            self.http.post('/api/start_bot', json={'name': 'TestBot'}),
+            self.http.post('/api/stop_bot', json={'name': 'TestBot'}),
+        ]
+        
+        # Verify
+        self.assertEqual([response.get_json() for response in responses], [{'success': True}] * 4)
+        self.assertEqual([call.args for call in bots_manager.start_bot.call_args_list], [('HelloBot',), ('TestBot',)])
+        self.assertEqual([call.args for call in bots_manager.stop_bot.call_args_list], [('HelloBot',), ('TestBot',)])
+    
+    def test_bot_action_errors(self):
+        """Test that unknown actions are 404s and a missing name is reported."""
+        self.assertEqual(self.http.post('/api/bot/restart', json={'name': 'HelloBot'}).status_code, 404)
+        self.assertEqual(self.http.post('/api/bot/start', json={}).get_json(),
+                         {'success': False, 'error': 'No bot name provided'})
+        self.web_ui.bots_manager.start_bot.assert_not_called()
+
+
+class TestWebUIServer(unittest.TestCase):
+    """Test starting and stopping the web UI server."""
+    
+    def test_stop_does_not_wait_for_long_polls(self):
+        """Test that an open Socket.IO long-poll is disconnected instead of holding up stop()."""
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        
+        web_ui = _make_ui()
+        web_ui.port = port
+        web_ui.start()
+        try:
+            # Open an Engine.IO session and leave a poll waiting on it
+            base = f"http://127.0.0.1:{port}/socket.io/?EIO=4&transport=polling"
+            for _ in range(50):
+                try:
+                    handshake = requests.get(base, timeout=5)
+                    break
+                except requests.ConnectionError:
+                    time.sleep(0.1)
+            sid = json.loads(handshake.text[1:])['sid']
+            poll = threading.Thread(target=requests.get, args=(f"{base}&sid={sid}",), kwargs={'timeout': 30})
+            poll.start()
+            time.sleep(0.2)
+        finally:
+            start = time.monotonic()
+            web_ui.stop()
+        
+        # Verify
+        self.assertLess(time.monotonic() - start, ui.SHUTDOWN_TIMEOUT)
+        self.assertFalse(web_ui.thread.is_alive())
+        poll.join(5)
+
+
+class TestSocketIOEvents(unittest.TestCase):
+    """Test the web UI's Socket.IO event handlers."""
+    
+    def test_connect_accepts_auth(self):
+        """Test that the connect handler takes the auth argument and sends the initial state."""
+        web_ui = _make_ui()
+        try:
+            with patch.object(web_ui.socketio, 'emit', new_callable=AsyncMock) as emit:
+                handler = web_ui.socketio.handlers['/']['connect']
+                asyncio.run(handler('sid1', {}, {'token': 'x'}))
+            
+            # Verify
+            emit.assert_called_once()
+            self.assertEqual(emit.call_args.args[0], 'state')
+            self.assertEqual(emit.call_args.kwargs, {'to': 'sid1'})
+        finally:
+            web_ui.stop()
+
+
+class TestMessageBatching(unittest.TestCase):
+    """Test how received messages are batched for WebSocket clients."""
+    
+    def setUp(self):
+        """Create a web UI whose broadcasts are recorded on a running event loop."""
+        self.web_ui = _make_ui()
+        self.batches = []
+        self.flushed = threading.Event()
+        
+        async def broadcast(event, payload):
+            self.batches.append((time.monotonic(), event, [item['text'] for item in payload]))
+            self.flushed.set()
+        
+        self.web_ui._broadcast = broadcast
+        
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever)
+        self.loop_thread.start()
+        self.web_ui._loop = self.loop
+    
+    def tearDown(self):
+        """Stop the event loop and release the web UI."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join()
+        self.loop.close()
+        self.web_ui.stop()
+    
+    def test_lone_message_flushed_after_batch_delay(self):
+        """Test that a message without a burst goes out after the batch delay."""
+        start = time.monotonic()
+        self.web_ui._on_message_received("hi", "!a", {'channel': 0})
+        
+        # Verify
+        self.assertTrue(self.flushed.wait(2.0))
+        flushed_at, event, texts = self.batches[0]
+        self.assertEqual((event, texts), ('message_batch', ['hi']))
+        self.assertGreaterEqual(flushed_at - start, ui.MESSAGE_BATCH_DELAY)
+        self.assertLess(flushed_at - start, ui.BURST_WINDOW)
+    
+    def test_burst_holds_batch_in_arrival_order(self):
+        """Test that a burst holds the batch until its window ends and keeps arrival order."""
+        start = time.monotonic()
+        for text, sender in (("a1", "!a"), ("b1", "!b"), ("a2", "!a"), ("b2", "!b")):
+            self.web_ui._on_message_received(text, sender, {'channel': 0})
+        
+        # Verify
+        self.assertTrue(self.flushed.wait(2.0))
+        time.sleep(ui.BURST_WINDOW)
+        self.assertEqual(len(self.batches), 1)
+        flushed_at, _, texts = self.batches[0]
+        self.assertEqual(texts, ["a1", "b1", "a2", "b2"])
+        self.assertGreaterEqual(flushed_at - start, ui.BURST_WINDOW)
+    
+    def test_staggered_bursts_hold_batch_one_window_at_most(self):
+        """Test that overlapping bursts from a stream of senders can't hold the batch indefinitely."""
+        start = time.monotonic()
+        texts = []
+        
+        # A new sender every 0.1s, each sending twice: there is always a burst in progress
+        for i in range(16):
+            text = f"m{i}"
+            texts.append(text)
+            self.web_ui._on_message_received(text, f"!{i // 2}", {'channel': 0})
+            time.sleep(0.05)
+        
+        time.sleep(ui.BURST_WINDOW * 2)
+        
+        # Verify
+        self.assertGreater(len(self.batches), 1)
+        self.assertLess(self.batches[0][0] - start, ui.BURST_WINDOW + 0.1)
+        self.assertEqual([text for _, _, batch in self.batches for text in batch], texts)
+
+if __name__ == '__main__':
+    unittest.main()